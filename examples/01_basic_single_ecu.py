@@ -2,13 +2,23 @@
 Basic example: Single ECU communication using udsonip.
 """
 
+from udsoncan import AsciiCodec
+from udsoncan.configs import default_client_config
 from udsonip import UdsOnIpClient
 
+# Codecs for the DIDs read below (the software version length is ECU specific)
+config = dict(default_client_config)
+config['data_identifiers'] = {
+    0xF190: AsciiCodec(17),  # VIN
+    0xF195: AsciiCodec(8),   # Software version
+}
+
 def main():
     # Create client connected to a single ECU
     client = UdsOnIpClient(
         ecu_ip='192.168.1.10',
-        ecu_address=0x00E0  # Engine ECU
+        ecu_address=0x00E0,  # Engine ECU
+        config=config,
     )
     
     try:
@@ -17,17 +27,11 @@ def main():
         response = client.tester_present()
         print(f"✓ TesterPresent response: {response}")
         
-        # Read VIN (Data Identifier 0xF190)
-        print("\nReading VIN...")
-        response = client.read_data_by_identifier(0xF190)
-        vin = response.data.decode('ascii', errors='ignore')
-        print(f"✓ VIN: {vin}")
-        
-        # Read ECU software version (DID 0xF195)
-        print("\nReading software version...")
-        response = client.read_data_by_identifier(0xF195)
-        version = response.data.hex()
-        print(f"✓ Software Version: {version}")
+        # Read VIN (DID 0xF190) and software version (DID 0xF195) in one request
+        print("\nReading VIN and software version...")
+        values = client.read_data_by_identifiers([0xF190, 0xF195])
+        print(f"✓ VIN: {values[0xF190]}")
+        print(f"✓ Software Version: {values[0xF195]}")
         
         # Read active DTCs
         print("\nReading DTCs...")
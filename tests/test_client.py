@@ -1,28 +1,40 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from udsonip.client import UdsOnIpClient
+from udsonip.connection import UdsOnIpConnection
 from udsonip.exceptions import ConnectionError, AddressSwitchError
 
 
+@pytest.fixture(scope="module")
+def mocked_client_deps():
+    """Patch DoIPClient, UDSClient and UdsOnIpConnection once for the whole module."""
+    with patch("udsonip.client.DoIPClient") as MockDoIPClient, patch(
+        "udsonip.client.UDSClient"
+    ) as MockUDSClient, patch("udsonip.client.UdsOnIpConnection") as MockUdsOnIpConnection:
+        yield MockDoIPClient, MockUDSClient, MockUdsOnIpConnection
+
+
+@pytest.fixture(autouse=True)
+def reset_client_deps(mocked_client_deps):
+    """Reset the shared mocks so every test starts from a clean slate."""
+    for mock in mocked_client_deps:
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
 @pytest.fixture
-def client():
+def client(mocked_client_deps):
     """Fixture for a UdsOnIpClient instance."""
-    with patch("udsonip.client.DoIPClient"), patch("udsonip.client.UDSClient"), patch(
-        "udsonip.client.UdsOnIpConnection"
-    ):
-        client = UdsOnIpClient("192.168.1.1", 0x00E0)
-        yield client
-        client.close()
+    client = UdsOnIpClient("192.168.1.1", 0x00E0)
+    yield client
+    client.close()
 
 
 class TestUdsOnIpClient:
     """Tests for the UdsOnIpClient."""
 
-    @patch("udsonip.client.DoIPClient")
-    @patch("udsonip.client.UDSClient")
-    @patch("udsonip.client.UdsOnIpConnection")
-    def test_init(self, MockUdsOnIpConnection, MockUDSClient, MockDoIPClient):
+    def test_init(self, mocked_client_deps):
         """Test that the client initializes correctly."""
+        MockDoIPClient, MockUDSClient, MockUdsOnIpConnection = mocked_client_deps
         UdsOnIpClient(
             "192.168.1.1", 0x00E0, client_ip="192.168.1.100", client_logical_address=0x0E01
         )
@@ -42,18 +54,12 @@ class TestUdsOnIpClient:
 
         MockUdsOnIpConnection.return_value.open.assert_called_once()
 
-    @patch("udsonip.client.DoIPClient")
-    @patch("udsonip.client.UDSClient")
-    @patch("udsonip.client.UdsOnIpConnection")
-    def test_init_connection_error(self, MockUdsOnIpConnection, MockUDSClient, MockDoIPClient):
+    def test_init_connection_error(self, mocked_client_deps):
         """Test that a ConnectionError is raised if the DoIPClient fails to connect."""
-        MockUdsOnIpConnection.return_value.open.side_effect = Exception(
-            "Connection failed"
-        )
+        _, _, MockUdsOnIpConnection = mocked_client_deps
+        MockUdsOnIpConnection.return_value.open.side_effect = Exception("Connection failed")
 
-        with pytest.raises(
-            ConnectionError, match="Failed to connect to 192.168.1.1:0xe0"
-        ):
+        with pytest.raises(ConnectionError, match="Failed to connect to 192.168.1.1:0xe0"):
             UdsOnIpClient("192.168.1.1", 0x00E0)
 
     def test_target_address_setter(self, client):
@@ -61,17 +67,23 @@ class TestUdsOnIpClient:
         client.target_address = 0x00E1
         assert client._connection.target_address == 0x00E1
 
-    @patch("udsonip.client.DoIPClient")
-    @patch("udsonip.client.UDSClient")
-    def test_target_address_setter_error(self, MockUDSClient, MockDoIPClient):
+    def test_target_address_setter_error(self, mocked_client_deps):
         """Test that an AddressSwitchError is raised for an invalid address."""
-        client = UdsOnIpClient("192.168.1.1", 0x00E0)
+        # Address validation lives in the real connection class
+        with patch("udsonip.client.UdsOnIpConnection", UdsOnIpConnection):
+            client = UdsOnIpClient("192.168.1.1", 0x00E0)
         with pytest.raises(
             AddressSwitchError,
             match="Invalid logical address: 0x10000. Must be a 16-bit integer.",
         ):
             client.target_address = 0x10000
 
+    def test_slots(self, client):
+        """Test that the client does not allocate a per-instance __dict__."""
+        assert not hasattr(client, "__dict__")
+        with pytest.raises(AttributeError):
+            client.unknown_attribute = 1
+
     def test_uds_property(self, client):
         """Test that the uds property returns the underlying UDSClient."""
         assert isinstance(client.uds, MagicMock)  # In the test fixture, UDSClient is a MagicMock
@@ -82,24 +94,29 @@ class TestUdsOnIpClient:
         client._connection.close.assert_called_once()
         client._doip.close.assert_called_once()
 
-    @patch("udsonip.client.UdsOnIpConnection")
-    def test_close_error(self, MockUdsOnIpConnection):
-        """Test that a ConnectionError is raised if closing the connection fails."""
-        with patch("udsonip.client.DoIPClient"), patch("udsonip.client.UDSClient"):
-            client = UdsOnIpClient("192.168.1.1", 0x00E0)
+    def test_close_error(self, mocked_client_deps):
+        """Test that close logs a failing step and still closes the DoIP client."""
+        client = UdsOnIpClient("192.168.1.1", 0x00E0)
         client._connection.close.side_effect = Exception("Close failed")
-        with pytest.raises(ConnectionError, match="Error closing connection"):
-            client.close()
 
-    def test_context_manager(self):
+        client.close()
+
+        client._connection.logger.warning.assert_called_once()
+        client._doip.close.assert_called_once()
+
+    def test_close_idempotent(self, client):
+        """Test that closing twice only closes the underlying connections once."""
+        client.close()
+        client.close()
+        client._connection.close.assert_called_once()
+        client._doip.close.assert_called_once()
+
+    def test_context_manager(self, mocked_client_deps):
         """Test that the client can be used as a context manager."""
-        with patch("udsonip.client.DoIPClient"), patch("udsonip.client.UDSClient"), patch(
-            "udsonip.client.UdsOnIpConnection"
-        ):
-            with UdsOnIpClient("192.168.1.1", 0x00E0) as client:
-                assert isinstance(client, UdsOnIpClient)
-            # close() is called on exit, so close() should have been called
-            client._doip.close.assert_called_once()
+        with UdsOnIpClient("192.168.1.1", 0x00E0) as client:
+            assert isinstance(client, UdsOnIpClient)
+        # close() is called on exit, so close() should have been called
+        client._doip.close.assert_called_once()
 
 
 class TestConvenienceMethods:
@@ -107,76 +124,105 @@ class TestConvenienceMethods:
 
     def test_tester_present(self, client):
         """Test the tester_present method."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.tester_present(suppress_response=True)
-            mock_uds.tester_present.assert_called_once_with(suppress_response=True)
+        mock_uds = client.uds
+        client.tester_present(suppress_response=True)
+        mock_uds.tester_present.assert_called_once_with(suppress_response=True)
 
     def test_read_data_by_identifier(self, client):
         """Test the read_data_by_identifier method."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.read_data_by_identifier(0xF190)
-            mock_uds.read_data_by_identifier.assert_called_once_with(0xF190)
+        mock_uds = client.uds
+        client.read_data_by_identifier(0xF190)
+        mock_uds.read_data_by_identifier.assert_called_once_with(0xF190)
+
+    def test_read_data_by_identifiers(self, client):
+        """Test that read_data_by_identifiers issues a single multi-DID request."""
+        mock_uds = client.uds
+        mock_uds.read_data_by_identifier.return_value.service_data.values = {
+            0xF190: "VIN",
+            0xF195: "1.0",
+        }
+        values = client.read_data_by_identifiers((0xF190, 0xF195))
+        mock_uds.read_data_by_identifier.assert_called_once_with([0xF190, 0xF195])
+        assert values == {0xF190: "VIN", 0xF195: "1.0"}
 
     def test_write_data_by_identifier(self, client):
         """Test the write_data_by_identifier method."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.write_data_by_identifier(0xF190, b"\x01\x02")
-            mock_uds.write_data_by_identifier.assert_called_once_with(0xF190, b"\x01\x02")
+        mock_uds = client.uds
+        client.write_data_by_identifier(0xF190, b"\x01\x02")
+        mock_uds.write_data_by_identifier.assert_called_once_with(0xF190, b"\x01\x02")
 
     def test_read_dtc_information(self, client):
         """Test the read_dtc_information method."""
-        with patch.object(client, "_uds") as mock_uds:
-            from udsoncan import services
+        mock_uds = client.uds
+        from udsoncan import services
+
+        client.read_dtc_information(dtc_status_mask=0x2F)
+        mock_uds.read_dtc_information.assert_called_once_with(
+            services.ReadDTCInformation.Subfunction.reportDTCByStatusMask, 0x2F
+        )
+
+    def test_read_dtc_status(self, client):
+        """Test that read_dtc_status decodes the raw DTC records."""
+        mock_uds = client.uds
+        mock_uds.send_request.return_value.data = (
+            b"\x02\xff" b"\x12\x34\x56\x2f" b"\xc1\x00\x01\x08" b"\x00"  # truncated record
+        )
+
+        dtcs = client.read_dtc_status(0x2F)
 
-            client.read_dtc_information(dtc_status_mask=0x2F)
-            mock_uds.read_dtc_information.assert_called_once_with(
-                services.ReadDTCInformation.Subfunction.reportDTCByStatusMask, 0x2F
-            )
+        assert dtcs == {0x123456: 0x2F, 0xC10001: 0x08}
+        request = mock_uds.send_request.call_args.args[0]
+        assert request.get_payload() == b"\x19\x02\x2f"
 
     def test_clear_dtc(self, client):
         """Test the clear_dtc method."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.clear_dtc(0x123456)
-            mock_uds.clear_dtc.assert_called_once_with(0x123456)
+        mock_uds = client.uds
+        client.clear_dtc(0x123456)
+        mock_uds.clear_dtc.assert_called_once_with(0x123456)
 
     def test_ecu_reset(self, client):
         """Test the ecu_reset method."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.ecu_reset(2)
-            mock_uds.ecu_reset.assert_called_once_with(2)
+        mock_uds = client.uds
+        client.ecu_reset(2)
+        mock_uds.ecu_reset.assert_called_once_with(2)
 
     def test_change_session(self, client):
         """Test the change_session method."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.change_session(3)
-            mock_uds.change_session.assert_called_once_with(3)
+        mock_uds = client.uds
+        client.change_session(3)
+        mock_uds.change_session.assert_called_once_with(3)
 
     def test_security_access_seed(self, client):
         """Test the security_access method for requesting a seed."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.security_access(1)
-            mock_uds.request_seed.assert_called_once_with(1)
+        mock_uds = client.uds
+        client.security_access(1)
+        mock_uds.request_seed.assert_called_once_with(1)
 
     def test_security_access_key(self, client):
         """Test the security_access method for sending a key."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.security_access(1, key=b"\x01\x02")
-            mock_uds.send_key.assert_called_once_with(1, b"\x01\x02")
+        mock_uds = client.uds
+        client.security_access(1, key=b"\x01\x02")
+        mock_uds.send_key.assert_called_once_with(1, b"\x01\x02")
 
     def test_routine_control_start(self, client):
         """Test the routine_control method for starting a routine."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.routine_control(0x1234, 1, data=b"\xab")
-            mock_uds.start_routine.assert_called_once_with(0x1234, b"\xab")
+        mock_uds = client.uds
+        client.routine_control(0x1234, 1, data=b"\xab")
+        mock_uds.start_routine.assert_called_once_with(0x1234, b"\xab")
 
     def test_routine_control_stop(self, client):
         """Test the routine_control method for stopping a routine."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.routine_control(0x1234, 2, data=b"\xcd")
-            mock_uds.stop_routine.assert_called_once_with(0x1234, b"\xcd")
+        mock_uds = client.uds
+        client.routine_control(0x1234, 2, data=b"\xcd")
+        mock_uds.stop_routine.assert_called_once_with(0x1234, b"\xcd")
 
     def test_routine_control_result(self, client):
         """Test the routine_control method for requesting results."""
-        with patch.object(client, "_uds") as mock_uds:
-            client.routine_control(0x1234, 3, data=b"\xef")
-            mock_uds.get_routine_result.assert_called_once_with(0x1234, b"\xef")
+        mock_uds = client.uds
+        client.routine_control(0x1234, 3, data=b"\xef")
+        mock_uds.get_routine_result.assert_called_once_with(0x1234, b"\xef")
+
+    def test_routine_control_invalid_type(self, client):
+        """Test that an unknown routine control type is rejected."""
+        with pytest.raises(ValueError, match="Invalid routine control type: 4"):
+            client.routine_control(0x1234, 4)
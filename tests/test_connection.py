@@ -2,49 +2,89 @@
 Tests for udsonip connection module.
 """
 
+import asyncio
+import logging
+import socket
+import ssl
 import pytest
-from unittest.mock import Mock
-from udsonip.connection import UdsOnIpConnection
+from unittest.mock import MagicMock, create_autospec, patch
+from doipclient import DoIPClient
+from doipclient.client import Parser
+from doipclient.messages import (
+    DiagnosticMessage,
+    DiagnosticMessageNegativeAcknowledgement,
+    DiagnosticMessagePositiveAcknowledgement,
+    RoutingActivationRequest,
+    RoutingActivationResponse,
+    payload_message_to_type,
+)
+from udsonip.connection import AsyncUdsOnIpConnection, UdsOnIpConnection, _Reactor
 from udsonip.exceptions import AddressSwitchError
 
 
+@pytest.fixture
+def mock_doip():
+    """Fixture for a DoIPClient mock restricted to the real DoIPClient API."""
+    # spec_set is not used: _ecu_logical_address and the socket attributes are
+    # assigned in DoIPClient.__init__ and are therefore not part of the class spec.
+    mock = create_autospec(DoIPClient, instance=True)
+    mock._ecu_logical_address = 0x00E0
+    mock._client_logical_address = 0x0E00
+    return mock
+
+
+def _response(source, payload, target=0x0E00):
+    """Build the DiagnosticMessage an ECU sends back to the tester."""
+    return DiagnosticMessage(source, target, payload)
+
+
 class TestUdsOnIpConnection:
     """Tests for UdsOnIpConnection class."""
 
-    def test_init_with_explicit_address(self):
+    def test_init_with_explicit_address(self, mock_doip):
         """Test initialization with explicit target address."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
-
         conn = UdsOnIpConnection(mock_doip, target_address=0x00E1)
 
         assert conn.target_address == 0x00E1
         assert conn._doip == mock_doip
 
-    def test_init_with_default_address(self):
+    def test_init_with_default_address(self, mock_doip):
         """Test initialization using DoIPClient's address."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
-
         conn = UdsOnIpConnection(mock_doip)
 
         assert conn.target_address == 0x00E0
 
-    def test_target_address_setter(self):
+    def test_target_address_setter(self, mock_doip):
         """Test changing target address."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
-
         conn = UdsOnIpConnection(mock_doip)
         conn.target_address = 0x00E2
 
         assert conn.target_address == 0x00E2
 
-    def test_target_address_setter_invalid(self):
-        """Test that an AddressSwitchError is raised for an invalid address."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
+    def test_target_address_setter_logs_hex(self, mock_doip, caplog):
+        """Test that address switches are logged with the memoized hex string."""
+        conn = UdsOnIpConnection(mock_doip)
+        with caplog.at_level(logging.INFO, logger=conn.logger.name):
+            conn.target_address = 0x00E2
+            conn.target_address = 0x00E0
 
+        assert [r.getMessage() for r in caplog.records] == [
+            "Target address switched to 0xe2",
+            "Target address switched to 0xe0",
+        ]
+
+    def test_target_address_setter_unchanged(self, mock_doip):
+        """Test that re-assigning the current address is a no-op."""
+        conn = UdsOnIpConnection(mock_doip)
+        with patch.object(conn, "logger") as mock_logger:
+            conn.target_address = 0x00E0
+
+        assert conn.target_address == 0x00E0
+        mock_logger.info.assert_not_called()
+        assert mock_doip.method_calls == []
+
+    def test_target_address_setter_invalid(self, mock_doip):
+        """Test that an AddressSwitchError is raised for an invalid address."""
         conn = UdsOnIpConnection(mock_doip)
 
         with pytest.raises(
@@ -53,11 +93,17 @@ class TestUdsOnIpConnection:
         ):
             conn.target_address = 0x10000
 
-    def test_open_close(self):
-        """Test open and close operations."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
+    @pytest.mark.parametrize("value", [-1, 0x1FFFF, "0xE0", None])
+    def test_target_address_setter_rejects(self, mock_doip, value):
+        """Test that negative, oversized and non-integer addresses are rejected."""
+        conn = UdsOnIpConnection(mock_doip)
 
+        with pytest.raises(AddressSwitchError, match="Must be a 16-bit integer"):
+            conn.target_address = value
+        assert conn.target_address == 0x00E0
+
+    def test_open_close(self, mock_doip):
+        """Test open and close operations."""
         conn = UdsOnIpConnection(mock_doip)
 
         assert not conn.is_open()
@@ -68,39 +114,422 @@ class TestUdsOnIpConnection:
         conn.close()
         assert not conn.is_open()
 
-    def test_specific_send(self):
+    def test_specific_send(self, mock_doip):
         """Test sending data."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
-
         conn = UdsOnIpConnection(mock_doip, target_address=0x00E1)
         payload = b"\x10\x01"  # Diagnostic session control
 
         conn.specific_send(payload)
 
-        mock_doip.send_diagnostic_to_address.assert_called_once_with(0x00E1, bytearray(payload))
+        mock_doip.send_doip_message.assert_called_once()
+        (message,) = mock_doip.send_doip_message.call_args.args
+        assert type(message) is DiagnosticMessage
+        assert (message.source_address, message.target_address) == (0x0E00, 0x00E1)
+        assert message.user_data is payload  # forwarded without copying
+        # The acknowledgement is left to the next reader
+        mock_doip.read_doip.assert_not_called()
+        # The address shared with other connections is left alone
+        assert mock_doip._ecu_logical_address == 0x00E0
+
+    def test_specific_send_skips_hex_dump(self, mock_doip):
+        """Test that the payload is not hex-encoded unless debug logging is enabled."""
+        conn = UdsOnIpConnection(mock_doip, target_address=0x00E1)
+        payload = MagicMock()
+
+        with patch.object(conn.logger, "isEnabledFor", return_value=False):
+            conn.specific_send(payload)
 
-    def test_specific_wait_frame(self):
+        payload.hex.assert_not_called()
+        assert mock_doip.send_doip_message.call_args.args[0].user_data is payload
+
+    def test_specific_wait_frame(self, mock_doip):
         """Test receiving data."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
-        mock_doip.receive_diagnostic.return_value = b"\x50\x01\x00\x00"
+        message = _response(0x00E0, b"\x50\x01\x00\x00")
+        mock_doip.read_doip.return_value = message
 
         conn = UdsOnIpConnection(mock_doip)
 
         response = conn.specific_wait_frame(timeout=1.0)
 
         assert response == b"\x50\x01\x00\x00"
-        mock_doip.receive_diagnostic.assert_called_once_with(timeout=1.0)
+        assert response is message.user_data  # bytes are not copied
+        mock_doip.read_doip.assert_called_once()
+        assert 0 < mock_doip.read_doip.call_args.kwargs["timeout"] <= 1.0
+
+    def test_specific_wait_frame_matches_target_address(self, mock_doip, caplog):
+        """Test that acknowledgements and other testers' messages are skipped."""
+        mock_doip.read_doip.side_effect = [
+            DiagnosticMessagePositiveAcknowledgement(0x00E1, 0x0E00, 0),
+            _response(0x00E1, b"\x50\x03", target=0x0E01),
+            _response(0x00E1, b"\x50\x02"),
+        ]
+
+        conn = UdsOnIpConnection(mock_doip, target_address=0x00E1)
+
+        with caplog.at_level(logging.WARNING, logger=conn.logger.name):
+            assert conn.specific_wait_frame(timeout=1.0) == b"\x50\x02"
+
+        assert [r.getMessage() for r in caplog.records] == [
+            "Ignoring diagnostic message from 0xe1 to 0xe01",
+        ]
+        assert mock_doip._ecu_logical_address == 0x00E0
+
+    def test_specific_wait_frame_hands_over_responses(self, mock_doip):
+        """Test that responses read for another ECU reach that ECU's connection."""
+        mock_doip.read_doip.side_effect = [
+            _response(0x00E0, b"\x50\x01"),
+            _response(0x00E1, b"\x50\x02"),
+        ]
+        reactor = _Reactor()
+        engine = UdsOnIpConnection(mock_doip, 0x00E0, reactor=reactor)
+        gearbox = UdsOnIpConnection(mock_doip, 0x00E1, reactor=reactor)
+
+        assert gearbox.specific_wait_frame(timeout=1.0) == b"\x50\x02"
+        assert engine.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+        assert mock_doip.read_doip.call_count == 2
+
+        # Responses left over from an earlier request are dropped before a new one
+        reactor.stash(0x00E0, b"\x50\x01")
+        engine.empty_rxqueue()
+        mock_doip.read_doip.side_effect = TimeoutError("ECU failed to respond in time")
+        assert engine.specific_wait_frame(timeout=0.01) is None
+        reactor.close()
+
+    def test_specific_wait_frame_negative_acknowledge(self, mock_doip):
+        """Test that a rejected request raises IOError, also for another connection."""
+        mock_doip.read_doip.side_effect = [
+            DiagnosticMessageNegativeAcknowledgement(0x00E1, 0x0E00, 0x03),
+            DiagnosticMessageNegativeAcknowledgement(0x00E0, 0x0E00, 0x06),
+        ]
+        reactor = _Reactor()
+        engine = UdsOnIpConnection(mock_doip, 0x00E0, reactor=reactor)
+        gearbox = UdsOnIpConnection(mock_doip, 0x00E1, reactor=reactor)
+
+        with pytest.raises(IOError, match="negative acknowledge code: 6"):
+            engine.specific_wait_frame(timeout=1.0)
+        with pytest.raises(IOError, match="negative acknowledge code: 3"):
+            gearbox.specific_wait_frame(timeout=1.0)
+        reactor.close()
+
+    def test_shared_reactor(self, mock_doip):
+        """Test that connections sharing a reactor wait on the same selector."""
+        local, remote = socket.socketpair()
+        reactor = _Reactor()
+        try:
+            mock_doip._tcp_sock = local
+            mock_doip._tcp_parser = Parser()
+            mock_doip.read_doip.side_effect = [
+                _response(0x00E0, b"\x50\x01"),
+                _response(0x00E1, b"\x50\x01"),
+                _response(0x00E1, b"\x50\x01"),
+            ]
+
+            engine = UdsOnIpConnection(mock_doip, 0x00E0, reactor=reactor)
+            gearbox = UdsOnIpConnection(mock_doip, 0x00E1, reactor=reactor)
+
+            remote.send(b"\x00")
+            assert engine.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+            assert gearbox.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+
+            # Closing a connection leaves the shared reactor usable
+            engine.close()
+            assert gearbox.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+        finally:
+            reactor.close()
+            local.close()
+            remote.close()
+
+    def test_specific_wait_frame_bytearray(self, mock_doip):
+        """Test that mutable frames from DoIPClient are returned as bytes."""
+        mock_doip.read_doip.return_value = _response(0x00E0, bytearray(b"\x50\x01"))
+
+        conn = UdsOnIpConnection(mock_doip)
+
+        response = conn.specific_wait_frame(timeout=1.0)
 
-    def test_specific_wait_frame_timeout(self):
+        assert type(response) is bytes
+        assert response == b"\x50\x01"
+
+    def test_specific_wait_frame_timeout(self, mock_doip):
         """Test receiving data with timeout."""
-        mock_doip = Mock()
-        mock_doip._ecu_logical_address = 0x00E0
-        mock_doip.receive_diagnostic.return_value = None
+        mock_doip.read_doip.side_effect = TimeoutError("ECU failed to respond in time")
 
         conn = UdsOnIpConnection(mock_doip)
 
         response = conn.specific_wait_frame(timeout=1.0)
 
         assert response is None
+
+    def test_specific_wait_frame_selects_socket(self, mock_doip):
+        """Test that the socket is polled before calling read_doip."""
+        local, remote = socket.socketpair()
+        try:
+            mock_doip._tcp_sock = local
+            mock_doip._tcp_parser = Parser()
+            mock_doip.read_doip.return_value = _response(0x00E0, b"\x50\x01")
+
+            conn = UdsOnIpConnection(mock_doip)
+
+            assert conn.specific_wait_frame(timeout=0.01) is None
+            mock_doip.read_doip.assert_not_called()
+
+            remote.send(b"\x00")
+            assert conn.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+            mock_doip.read_doip.assert_called_once()
+            # The time spent in select() is deducted from the read timeout
+            assert 0 < mock_doip.read_doip.call_args.kwargs["timeout"] <= 1.0
+
+            conn.close()
+        finally:
+            local.close()
+            remote.close()
+
+    def test_specific_wait_frame_default_timeout(self, mock_doip):
+        """Test that waiting without a timeout gives up after A_PROCESSING_TIME."""
+        local, remote = socket.socketpair()
+        try:
+            mock_doip._tcp_sock = local
+            mock_doip._tcp_parser = Parser()
+
+            conn = UdsOnIpConnection(mock_doip)
+
+            with patch("udsonip.connection.A_PROCESSING_TIME", 0.01):
+                assert conn.specific_wait_frame() is None
+            mock_doip.read_doip.assert_not_called()
+
+            conn.close()
+        finally:
+            local.close()
+            remote.close()
+
+    def test_specific_wait_frame_ssl_pending(self, mock_doip):
+        """Test that data buffered by the SSL layer skips the select() call."""
+        mock_doip._tcp_sock = create_autospec(ssl.SSLSocket, instance=True)
+        mock_doip._tcp_sock.pending.return_value = 16
+        mock_doip.read_doip.return_value = _response(0x00E0, b"\x50\x01")
+
+        conn = UdsOnIpConnection(mock_doip)
+
+        with patch.object(_Reactor, "wait_readable") as wait_readable:
+            assert conn.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+        wait_readable.assert_not_called()
+
+    def test_specific_wait_frame_after_reconnect(self, mock_doip):
+        """Test that a reconnected socket reusing the old descriptor is waited on."""
+        local, remote = socket.socketpair()
+        mock_doip._tcp_sock = local
+        mock_doip._tcp_parser = Parser()
+        mock_doip.read_doip.return_value = _response(0x00E0, b"\x50\x01")
+
+        conn = UdsOnIpConnection(mock_doip)
+        remote.send(b"\x00")
+        assert conn.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+
+        # DoIPClient.reconnect() closes its socket and opens a new one, which
+        # normally gets the same file descriptor back
+        fileno = local.fileno()
+        local.close()
+        remote.close()
+        local, remote = socket.socketpair()
+        try:
+            assert local.fileno() == fileno
+            mock_doip._tcp_sock = local
+
+            remote.send(b"\x00")
+            assert conn.specific_wait_frame(timeout=1.0) == b"\x50\x01"
+
+            conn.close()
+        finally:
+            local.close()
+            remote.close()
+
+
+class _FakeGateway:
+    """Minimal DoIP gateway answering routing activation and RDBI requests."""
+
+    def __init__(self, activation_code=0x10, delays=None):
+        self.activation_code = activation_code
+        self.delays = delays or {}
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        parser = Parser()
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                break
+            message = parser.read_message(data)
+            while message is not None:
+                await self._respond(writer, message)
+                message = parser.read_message(b"")
+        writer.close()
+
+    async def _respond(self, writer, message):
+        if isinstance(message, RoutingActivationRequest):
+            self._send(
+                writer,
+                RoutingActivationResponse(message.source_address, 0x0001, self.activation_code),
+            )
+        elif isinstance(message, DiagnosticMessage):
+            source, target = message.target_address, message.source_address
+            self._send(writer, DiagnosticMessagePositiveAcknowledgement(source, target, 0x00))
+            request = bytes(message.user_data)
+            if request[0] == 0x11:
+                # ECUReset of the gateway drops the connection
+                writer.close()
+                return
+            if request[0] == 0x22:
+                response = b"\x62" + request[1:3] + bytes([source & 0xFF])
+            elif request[0] == 0x3E:
+                if request[1] & 0x80:
+                    return
+                response = b"\x7e\x00"
+            else:
+                response = b"\x7f" + request[:1] + b"\x11"
+
+            async def reply():
+                await asyncio.sleep(self.delays.get(source, 0))
+                self._send(
+                    writer, DiagnosticMessage(source, target, b"\x7f" + request[:1] + b"\x78")
+                )
+                self._send(writer, DiagnosticMessage(source, target, response))
+
+            asyncio.ensure_future(reply())
+
+    @staticmethod
+    def _send(writer, message):
+        writer.write(
+            DoIPClient._pack_doip(0x03, payload_message_to_type[type(message)], message.pack())
+        )
+
+
+def _run_with_gateway(coro_factory, **kwargs):
+    async def runner():
+        gateway = _FakeGateway(**kwargs)
+        await gateway.start()
+        try:
+            return await coro_factory(gateway.port)
+        finally:
+            await gateway.stop()
+
+    return asyncio.run(runner())
+
+
+class TestAsyncUdsOnIpConnection:
+    """Tests for AsyncUdsOnIpConnection class."""
+
+    def test_slots(self):
+        """Test that the connection does not allocate a per-instance __dict__."""
+        conn = AsyncUdsOnIpConnection("127.0.0.1")
+        assert not hasattr(conn, "__dict__")
+
+    def test_open_close(self):
+        """Test that open performs routing activation and close releases the stream."""
+
+        async def scenario(port):
+            conn = AsyncUdsOnIpConnection("127.0.0.1", tcp_port=port)
+            assert not conn.is_open()
+            await conn.open()
+            assert conn.is_open()
+            await conn.close()
+            assert not conn.is_open()
+
+        _run_with_gateway(scenario)
+
+    def test_open_activation_denied(self):
+        """Test that a denied routing activation raises ConnectionRefusedError."""
+
+        async def scenario(port):
+            conn = AsyncUdsOnIpConnection("127.0.0.1", tcp_port=port)
+            with pytest.raises(ConnectionRefusedError):
+                await conn.open()
+            assert not conn.is_open()
+
+        _run_with_gateway(scenario, activation_code=0x00)
+
+    def test_concurrent_read_data_by_identifier(self):
+        """Test that responses are routed to the ECU that sent them."""
+
+        async def scenario(port):
+            conn = AsyncUdsOnIpConnection("127.0.0.1", tcp_port=port)
+            await conn.open()
+            try:
+                return await asyncio.gather(
+                    conn.read_data_by_identifier(0x00E0, 0xF190),
+                    conn.read_data_by_identifier(0x00E1, 0xF190),
+                )
+            finally:
+                await conn.close()
+
+        engine, transmission = _run_with_gateway(scenario, delays={0x00E0: 0.05})
+
+        assert engine.data == b"\xf1\x90\xe0"
+        assert transmission.data == b"\xf1\x90\xe1"
+
+    def test_tester_present(self):
+        """Test TesterPresent with and without a suppressed response."""
+
+        async def scenario(port):
+            conn = AsyncUdsOnIpConnection("127.0.0.1", tcp_port=port)
+            await conn.open()
+            try:
+                return (
+                    await conn.tester_present(0x00E0),
+                    await conn.tester_present(0x00E0, suppress_response=True),
+                )
+            finally:
+                await conn.close()
+
+        response, suppressed = _run_with_gateway(scenario)
+
+        assert response.positive
+        assert suppressed is None
+
+    def test_request_timeout(self):
+        """Test that a missing response raises TimeoutError."""
+
+        async def scenario(port):
+            conn = AsyncUdsOnIpConnection("127.0.0.1", tcp_port=port)
+            await conn.open()
+            try:
+                with pytest.raises(TimeoutError):
+                    await conn.request(0x00E0, b"\x3e\x80", timeout=0.05)
+            finally:
+                await conn.close()
+
+        _run_with_gateway(scenario)
+
+    def test_stream_failure(self):
+        """Test that requests fail right away once the gateway dropped the connection."""
+
+        async def scenario(port):
+            conn = AsyncUdsOnIpConnection("127.0.0.1", tcp_port=port)
+            await conn.open()
+            try:
+                with pytest.raises(ConnectionResetError):
+                    await conn.request(0x00E0, b"\x11\x01", timeout=5.0)
+                assert not conn.is_open()
+
+                # Requests to ECUs without a receive queue yet fail the same way
+                # instead of waiting for their timeout
+                start = asyncio.get_event_loop().time()
+                with pytest.raises(ConnectionResetError):
+                    await conn.request(0x00E1, b"\x22\xf1\x90", timeout=5.0)
+                with pytest.raises(ConnectionResetError):
+                    await conn.send(0x00E1, b"\x3e\x80")
+                assert asyncio.get_event_loop().time() - start < 1.0
+            finally:
+                await conn.close()
+            assert not conn.is_open()
+            assert conn._error is None
+
+        _run_with_gateway(scenario)
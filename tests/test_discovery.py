@@ -1,12 +1,42 @@
+import asyncio
 import pytest
+import socket
 import warnings
-from unittest.mock import patch
-from doipclient.messages import VehicleIdentificationResponse
-from udsonip.discovery import ECUInfo, get_entity, discover_ecus
+from unittest.mock import ANY, patch
+from doipclient import DoIPClient
+from doipclient.messages import VehicleIdentificationResponse, payload_message_to_type
+from udsonip.discovery import (
+    ECUInfo,
+    get_entity,
+    discover_ecus,
+    discover_ecus_async,
+    get_entity_async,
+    invalidate_discovery_cache,
+    scan_network,
+    scan_network_async,
+)
+
+# Imported before the autouse fixture replaces the module attribute
+from udsonip.discovery import _broadcast_interfaces as _real_broadcast_interfaces
+
+
+@pytest.fixture(autouse=True)
+def clear_discovery_cache():
+    """Start every test with empty discovery caches."""
+    invalidate_discovery_cache()
+    yield
+    invalidate_discovery_cache()
+
+
+@pytest.fixture(autouse=True)
+def default_interface():
+    """Broadcast on the default interface only, whatever interfaces the host has."""
+    with patch("udsonip.discovery._broadcast_interfaces", return_value=()) as mock:
+        yield mock
 
 
 class TestECUInfo:
-    """Tests for ECUInfo dataclass."""
+    """Tests for ECUInfo named tuple."""
 
     def test_init(self):
         """Test ECUInfo initialization."""
@@ -29,6 +59,35 @@ class TestECUInfo:
         ecu = ECUInfo(ip="192.168.1.10", logical_address=0x00E0)
         assert repr(ecu) == "ECUInfo(ip='192.168.1.10', logical_address=0x00E0)"
 
+    def test_str_repr_cached(self):
+        """Test that str() and repr() are formatted once per ECU."""
+        ecu = ECUInfo(ip="192.168.1.10", logical_address=0x00E0)
+
+        assert str(ecu) is str(ecu)
+        assert repr(ecu) is repr(ecu)
+        assert ecu == ECUInfo(ip="192.168.1.10", logical_address=0x00E0)
+
+    def test_frozen(self):
+        """Test that ECUInfo is immutable and hashable."""
+        ecu = ECUInfo(ip="192.168.1.10", logical_address=0x00E0)
+
+        with pytest.raises(AttributeError):
+            ecu.ip = "192.168.1.11"
+        assert ecu in {ECUInfo(ip="192.168.1.10", logical_address=0x00E0)}
+
+    def test_slots(self):
+        """Test that ECUInfo instances do not carry a __dict__."""
+        ecu = ECUInfo(ip="192.168.1.10", logical_address=0x00E0)
+        assert not hasattr(ecu, "__dict__")
+
+    def test_dedup(self):
+        """Test that duplicate ECUInfo entries collapse in a set and unpack as tuples."""
+        ecus = [ECUInfo("192.168.1.10", 0x00E0), ECUInfo("192.168.1.10", 0x00E0)]
+        assert len(set(ecus)) == 1
+
+        ip, logical_address, eid, gid, further_action_required = ecus[0]
+        assert (ip, logical_address, eid) == ("192.168.1.10", 0x00E0, None)
+
     @patch("udsonip.discovery.UdsOnIpClient")
     def test_connect(self, MockUdsOnIpClient):
         """Test the connect method creates a client."""
@@ -145,6 +204,18 @@ def test_discover_ecus_timeout(MockDoIPClient):
     MockDoIPClient.request_vehicle_identification.assert_called_once()
 
 
+@patch("udsonip.discovery.DoIPClient")
+def test_discover_ecus_waits_whole_window(MockDoIPClient):
+    """Test that discover_ecus waits for the remaining window in a single call."""
+    MockDoIPClient.await_vehicle_announcement.side_effect = TimeoutError
+
+    assert discover_ecus(timeout=5.0) == []
+
+    MockDoIPClient.await_vehicle_announcement.assert_called_once()
+    timeout = MockDoIPClient.await_vehicle_announcement.call_args[1]["timeout"]
+    assert 4.0 < timeout <= 5.0
+
+
 @patch("udsonip.discovery.DoIPClient")
 def test_discover_ecus_broadcast_failure(MockDoIPClient):
     """Test discover_ecus when broadcast fails but listening still works."""
@@ -242,6 +313,31 @@ def test_discover_ecus_generic_error(MockDoIPClient):
         discover_ecus()
 
 
+@patch("udsonip.discovery.DoIPClient")
+def test_discover_ecus_partial_results(MockDoIPClient):
+    """Test that an error after some announcements keeps the ECUs found so far."""
+    mock_announcement = VehicleIdentificationResponse(
+        vin=b"TESTVIN123456789",
+        logical_address=0x4001,
+        eid=b"EID001",
+        gid=b"GID001",
+        further_action_required=0x00,
+    )
+    MockDoIPClient.await_vehicle_announcement.side_effect = [
+        (("192.168.1.3", 13400), mock_announcement),
+        OSError("Network is down"),
+    ]
+
+    with pytest.warns(RuntimeWarning, match="partial results: Network is down"):
+        ecus = discover_ecus(timeout=5.0)
+
+    assert [(ecu.ip, ecu.logical_address) for ecu in ecus] == [("192.168.1.3", 0x4001)]
+
+    # Partial results are not cached
+    MockDoIPClient.await_vehicle_announcement.side_effect = TimeoutError
+    assert discover_ecus(timeout=0.1) == []
+
+
 @patch("udsonip.discovery.DoIPClient")
 def test_get_entity_generic_exception(MockDoIPClient):
     """Test that get_entity wraps a generic exception in DiscoveryError."""
@@ -253,3 +349,655 @@ def test_get_entity_generic_exception(MockDoIPClient):
         DiscoveryError, match="Failed to get entity info from 192.168.1.1: Generic network error"
     ):
         get_entity(ip="192.168.1.1")
+
+
+@patch("udsonip.discovery.DoIPClient")
+def test_get_entity_cached(MockDoIPClient):
+    """Test that get_entity caches successful results per IP and protocol version."""
+    mock_announcement = VehicleIdentificationResponse(
+        vin=b"TESTVIN123456789",
+        logical_address=0x1001,
+        eid=b"EID123",
+        gid=b"GID123",
+        further_action_required=0x00,
+    )
+    MockDoIPClient.get_entity.return_value = (("192.168.1.1", 13400), mock_announcement)
+
+    first = get_entity(ip="192.168.1.1")
+    second = get_entity(ip=" 192.168.1.1 ")
+
+    assert second is first
+    MockDoIPClient.get_entity.assert_called_once()
+
+    # Bypassing the cache or changing the protocol version issues a new request
+    get_entity(ip="192.168.1.1", use_cache=False)
+    get_entity(ip="192.168.1.1", protocol_version=0x02)
+    assert MockDoIPClient.get_entity.call_count == 3
+
+    invalidate_discovery_cache()
+    get_entity(ip="192.168.1.1")
+    assert MockDoIPClient.get_entity.call_count == 4
+
+
+@patch("udsonip.discovery.DoIPClient")
+def test_get_entity_cache_expires(MockDoIPClient):
+    """Test that cached entities are refreshed once older than ttl."""
+    mock_announcement = VehicleIdentificationResponse(
+        vin=b"TESTVIN123456789",
+        logical_address=0x1001,
+        eid=b"EID123",
+        gid=b"GID123",
+        further_action_required=0x00,
+    )
+    MockDoIPClient.get_entity.return_value = (("192.168.1.1", 13400), mock_announcement)
+
+    with patch("udsonip.discovery.time.monotonic", return_value=100.0):
+        get_entity(ip="192.168.1.1")
+    with patch("udsonip.discovery.time.monotonic", return_value=129.0):
+        get_entity(ip="192.168.1.1")
+    assert MockDoIPClient.get_entity.call_count == 1
+
+    with patch("udsonip.discovery.time.monotonic", return_value=131.0):
+        get_entity(ip="192.168.1.1")
+    assert MockDoIPClient.get_entity.call_count == 2
+
+
+@patch("udsonip.discovery.DoIPClient")
+def test_get_entity_timeout_not_cached(MockDoIPClient):
+    """Test that a timed-out get_entity is retried on the next call."""
+    MockDoIPClient.get_entity.side_effect = TimeoutError
+
+    assert get_entity(ip="192.168.1.2") is None
+    assert get_entity(ip="192.168.1.2") is None
+    assert MockDoIPClient.get_entity.call_count == 2
+
+
+@patch("udsonip.discovery.DoIPClient")
+def test_discover_ecus_cached(MockDoIPClient):
+    """Test that discover_ecus reuses a recent non-empty result."""
+    mock_announcement = VehicleIdentificationResponse(
+        vin=b"TESTVIN123456789",
+        logical_address=0x1002,
+        eid=b"EID456",
+        gid=b"GID456",
+        further_action_required=0x00,
+    )
+    call_count = {"count": 0}
+
+    def mock_await(*args, **kwargs):
+        call_count["count"] += 1
+        if call_count["count"] == 1:
+            return (("192.168.1.3", 13400), mock_announcement)
+        raise TimeoutError
+
+    MockDoIPClient.await_vehicle_announcement.side_effect = mock_await
+
+    first = discover_ecus(timeout=0.1)
+    second = discover_ecus(timeout=0.1)
+
+    assert second == first
+    MockDoIPClient.request_vehicle_identification.assert_called_once()
+
+    # A result collected over a shorter window is not served for a longer one
+    assert discover_ecus(timeout=0.05) == first
+    assert discover_ecus(timeout=0.2) == []
+    assert MockDoIPClient.request_vehicle_identification.call_count == 2
+
+    # An expired or bypassed cache triggers a new discovery
+    assert discover_ecus(timeout=0.1, ttl=0) == []
+    assert discover_ecus(timeout=0.1, use_cache=False) == []
+    assert MockDoIPClient.request_vehicle_identification.call_count == 4
+
+
+@patch("udsonip.discovery.DoIPClient")
+def test_discover_ecus_preserves_order(MockDoIPClient):
+    """Test that distinct ECUs behind one IP are kept in announcement order."""
+    announcements = [
+        VehicleIdentificationResponse(
+            vin=b"TESTVIN123456789",
+            logical_address=address,
+            eid=b"EIDORD",
+            gid=b"GIDORD",
+            further_action_required=0x00,
+        )
+        for address in (0x00E1, 0x00E0, 0x00E1)
+    ]
+    responses = iter(announcements)
+
+    def mock_await(*args, **kwargs):
+        try:
+            return (("192.168.1.20", 13400), next(responses))
+        except StopIteration:
+            raise TimeoutError
+
+    MockDoIPClient.await_vehicle_announcement.side_effect = mock_await
+
+    ecus = discover_ecus(timeout=0.1)
+
+    assert [ecu.logical_address for ecu in ecus] == [0x00E1, 0x00E0]
+
+
+def _announcement_datagram(logical_address, further_action_required=0x00):
+    """Pack a vehicle announcement datagram as sent by a DoIP entity."""
+    message = VehicleIdentificationResponse(
+        vin="TESTVIN123456789X",
+        logical_address=logical_address,
+        eid=b"EID001",
+        gid=b"GID001",
+        further_action_required=further_action_required,
+    )
+    return DoIPClient._pack_doip(0x03, payload_message_to_type[type(message)], message.pack())
+
+
+@patch("udsonip.discovery._create_discovery_socket")
+def test_discover_ecus_async(mock_create_socket):
+    """Test that discover_ecus_async collects and deduplicates announcements."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.setblocking(False)
+    mock_create_socket.return_value = listener
+
+    # Queue announcements (including a duplicate) before discovery starts listening
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for address in (0x4001, 0x4002, 0x4001):
+        sender.sendto(_announcement_datagram(address), listener.getsockname())
+    sender.close()
+
+    with patch("udsonip.discovery._VEHICLE_ID_BROADCAST", ("127.0.0.1", 9)):
+        ecus = asyncio.run(discover_ecus_async(timeout=0.1))
+
+    assert [ecu.logical_address for ecu in ecus] == [0x4001, 0x4002]
+    assert ecus[0].ip == "127.0.0.1"
+    assert ecus[0].eid == b"EID001"
+    assert listener.fileno() == -1  # closed when discovery ends
+
+
+@patch("udsonip.discovery._create_discovery_socket")
+def test_discover_ecus_async_socket_error(mock_create_socket):
+    """Test that discover_ecus_async wraps socket errors in DiscoveryError."""
+    from udsonip.exceptions import DiscoveryError
+
+    mock_create_socket.side_effect = OSError("Address already in use")
+
+    with pytest.raises(DiscoveryError, match="ECU discovery failed: Address already in use"):
+        asyncio.run(discover_ecus_async(timeout=0.1))
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT")
+@patch("udsonip.discovery._create_discovery_socket")
+def test_discover_ecus_parallel_listeners(mock_create_socket):
+    """Test that discover_ecus drains several listener sockets and merges the results."""
+    listeners = []
+    for _ in range(2):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.bind(("127.0.0.1", 0))
+        listeners.append(listener)
+    mock_create_socket.side_effect = listeners
+
+    # Spread announcements (including a duplicate) over both sockets
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.sendto(_announcement_datagram(0x4001), listeners[0].getsockname())
+    sender.sendto(_announcement_datagram(0x4002), listeners[1].getsockname())
+    sender.sendto(_announcement_datagram(0x4001), listeners[1].getsockname())
+    sender.close()
+
+    with patch("udsonip.discovery._VEHICLE_ID_BROADCAST", ("127.0.0.1", 9)):
+        ecus = discover_ecus(timeout=0.2, listeners=2)
+
+    assert sorted(ecu.logical_address for ecu in ecus) == [0x4001, 0x4002]
+    assert all(call[1] == {"reuse_port": True} for call in mock_create_socket.call_args_list)
+    assert all(listener.fileno() == -1 for listener in listeners)
+
+
+@patch("udsonip.discovery._SO_BINDTODEVICE", None)
+def test_discover_ecus_interfaces_unsupported():
+    """Test that interfaces are rejected where sockets cannot be bound to one."""
+    from udsonip.exceptions import DiscoveryError
+
+    with pytest.raises(DiscoveryError, match="Cannot listen on interface 'eth0'"):
+        discover_ecus(interface=["eth0", "eth1"], timeout=0.2)
+    with pytest.raises(DiscoveryError, match="SO_BINDTODEVICE"):
+        asyncio.run(discover_ecus_async(interface="eth0", timeout=0.2))
+
+
+@patch("udsonip.discovery._create_discovery_socket")
+def test_discover_ecus_interfaces(mock_create_socket):
+    """Test that discover_ecus listens on several interfaces within one timeout window."""
+    listeners = []
+    for _ in range(2):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.setblocking(False)
+        listeners.append(listener)
+    mock_create_socket.side_effect = listeners
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.sendto(_announcement_datagram(0x4001), listeners[0].getsockname())
+    sender.sendto(_announcement_datagram(0x4001), listeners[0].getsockname())
+    sender.sendto(_announcement_datagram(0x4002), listeners[1].getsockname())
+    sender.close()
+
+    with patch("udsonip.discovery._VEHICLE_ID_BROADCAST", ("127.0.0.1", 9)):
+        ecus = discover_ecus(interface=["eth0", "eth1"], timeout=0.2)
+
+    assert sorted(ecu.logical_address for ecu in ecus) == [0x4001, 0x4002]
+    assert [call[0] for call in mock_create_socket.call_args_list] == [("eth0",), ("eth1",)]
+    assert all(listener.fileno() == -1 for listener in listeners)
+
+    # Cached under the interface tuple
+    assert discover_ecus(interface=("eth0", "eth1"), timeout=0.2) == ecus
+
+
+@patch("udsonip.discovery._create_discovery_socket")
+def test_discover_ecus_all_interfaces(mock_create_socket, default_interface):
+    """Test that discover_ecus broadcasts on every usable interface by default."""
+    default_interface.return_value = ("eth0", "eth1")
+    listeners = []
+    for _ in range(2):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.setblocking(False)
+        listeners.append(listener)
+    mock_create_socket.side_effect = listeners
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.sendto(_announcement_datagram(0x4001), listeners[0].getsockname())
+    sender.sendto(_announcement_datagram(0x4002), listeners[1].getsockname())
+    sender.close()
+
+    with patch("udsonip.discovery._VEHICLE_ID_BROADCAST", ("127.0.0.1", 9)):
+        ecus = discover_ecus(timeout=0.2)
+
+    assert sorted(ecu.logical_address for ecu in ecus) == [0x4001, 0x4002]
+    assert [call[0] for call in mock_create_socket.call_args_list] == [("eth0",), ("eth1",)]
+
+
+def test_broadcast_interfaces():
+    """Test that loopback and interfaces that are down are not broadcast on."""
+    from udsonip import discovery
+
+    flags = {"lo": 0x9, "eth0": 0x1003, "eth1": 0x1002, "eth2": None, "wlan0": 0x1043}
+    with patch.object(discovery, "_SO_BINDTODEVICE", 25), patch.object(
+        discovery.socket, "if_nameindex", return_value=list(enumerate(flags, 1))
+    ), patch.object(discovery, "_interface_flags", side_effect=flags.get), patch.object(
+        discovery.socket, "socket"
+    ) as mock_socket:
+        assert _real_broadcast_interfaces() == ("eth0", "eth2", "wlan0")
+        mock_socket.return_value.close.assert_called_once()
+
+        # Not permitted to bind sockets to an interface
+        mock_socket.return_value.setsockopt.side_effect = PermissionError
+        assert _real_broadcast_interfaces() == ()
+
+    with patch.object(discovery, "_SO_BINDTODEVICE", None):
+        assert _real_broadcast_interfaces() == ()
+
+
+def test_vehicle_identification_request():
+    """Test that the precompiled header matches doipclient's packing."""
+    from doipclient.messages import VehicleIdentificationRequest
+    from udsonip.discovery import _vehicle_identification_request
+
+    expected = DoIPClient._pack_doip(
+        0x03, payload_message_to_type[VehicleIdentificationRequest], b""
+    )
+    assert _vehicle_identification_request(0x03) == expected
+
+
+def test_parse_vehicle_identification_response():
+    """Test decoding announcements with and without the VIN/GID sync status."""
+    from udsonip.discovery import _parse_vehicle_identification_response
+
+    message = _parse_vehicle_identification_response(_announcement_datagram(0x4001))
+    assert message.vin == "TESTVIN123456789X"
+    assert message.logical_address == 0x4001
+    assert message.eid == b"EID001"
+    assert message.gid == b"GID001"
+    assert message.vin_sync_status is None
+
+    synced = VehicleIdentificationResponse("TESTVIN123456789X", 0x4002, b"EID002", b"GID002", 0, 0)
+    datagram = DoIPClient._pack_doip(0x03, 0x0004, synced.pack())
+    message = _parse_vehicle_identification_response(datagram)
+    assert message.logical_address == 0x4002
+    assert message.vin_sync_status == 0
+
+
+def test_parse_vehicle_identification_response_invalid():
+    """Test that foreign or malformed datagrams are ignored."""
+    from udsonip.discovery import _parse_vehicle_identification_response
+
+    datagram = _announcement_datagram(0x4001)
+    assert _parse_vehicle_identification_response(b"") is None
+    assert _parse_vehicle_identification_response(datagram[:-1]) is None
+    assert _parse_vehicle_identification_response(b"\x03\x03" + datagram[2:]) is None
+    assert _parse_vehicle_identification_response(datagram[:2] + b"\x00\x05" + datagram[4:]) is None
+
+
+class _FakeEntity(asyncio.DatagramProtocol):
+    """DoIP entity answering every vehicle identification request."""
+
+    def __init__(self, logical_address, further_action_required=0x00):
+        self.logical_address = logical_address
+        self.further_action_required = further_action_required
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.transport.sendto(
+            _announcement_datagram(self.logical_address, self.further_action_required), addr
+        )
+
+
+def test_get_entity_async():
+    """Test that get_entity_async queries a single entity over UDP."""
+
+    async def scenario():
+        loop = asyncio.get_event_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _FakeEntity(0x4001), local_addr=("127.0.0.1", 0)
+        )
+        try:
+            port = transport.get_extra_info("sockname")[1]
+            with patch("udsonip.discovery._UDP_DISCOVERY_PORT", port):
+                return await get_entity_async("127.0.0.1", timeout=1.0)
+        finally:
+            transport.close()
+
+    ecu = asyncio.run(scenario())
+
+    assert ecu.ip == "127.0.0.1"
+    assert ecu.logical_address == 0x4001
+    # Shares the cache with get_entity()
+    assert get_entity("127.0.0.1") is ecu
+
+
+def test_get_entity_async_timeout():
+    """Test that get_entity_async returns None if the entity does not answer."""
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(("127.0.0.1", 0))
+    try:
+        with patch("udsonip.discovery._UDP_DISCOVERY_PORT", silent.getsockname()[1]):
+            assert asyncio.run(get_entity_async("127.0.0.1", timeout=0.05)) is None
+    finally:
+        silent.close()
+
+
+@patch("udsonip.discovery._query_entity")
+def test_scan_network(mock_query_entity):
+    """Test that scan_network probes every host and returns the responding ones."""
+    from udsonip.exceptions import DiscoveryError
+
+    async def fake_query_entity(probe, ip, timeout, protocol_version):
+        if ip == "192.168.1.2":
+            raise DiscoveryError("Network unreachable")
+        if ip in ("192.168.1.1", "192.168.1.5"):
+            return ECUInfo(ip=ip, logical_address=0x1000)
+        return None
+
+    mock_query_entity.side_effect = fake_query_entity
+
+    ecus = scan_network("192.168.1.0/29", timeout=0.5, max_concurrency=4)
+
+    assert [ecu.ip for ecu in ecus] == ["192.168.1.1", "192.168.1.5"]
+    assert mock_query_entity.call_count == 6  # .1 - .6, network and broadcast skipped
+    mock_query_entity.assert_any_call(ANY, "192.168.1.3", 0.5, 0x03)
+    # Every probe went through the same endpoint
+    assert len({call[0][0] for call in mock_query_entity.call_args_list}) == 1
+
+
+@patch("udsonip.discovery._query_entity")
+def test_scan_network_in_running_loop(mock_query_entity):
+    """Test that scan_network can be called from a coroutine."""
+
+    async def fake_query_entity(probe, ip, timeout, protocol_version):
+        return ECUInfo(ip=ip, logical_address=0x1000) if ip == "192.168.1.1" else None
+
+    mock_query_entity.side_effect = fake_query_entity
+
+    async def scenario():
+        return scan_network("192.168.1.0/30", timeout=0.5)
+
+    ecus = asyncio.run(scenario())
+
+    assert [ecu.ip for ecu in ecus] == ["192.168.1.1"]
+
+
+@pytest.mark.parametrize(
+    "network, expected",
+    [
+        ("192.168.1.0/30", ["192.168.1.1", "192.168.1.2"]),
+        ("192.168.1.0/31", ["192.168.1.0", "192.168.1.1"]),
+        ("192.168.1.7/32", ["192.168.1.7"]),
+        ("fd00::/126", ["fd00::1", "fd00::2", "fd00::3"]),
+    ],
+)
+def test_iter_hosts(network, expected):
+    """Test that subnets are enumerated as host address strings."""
+    import ipaddress
+    from udsonip.discovery import _iter_hosts
+
+    assert list(_iter_hosts(ipaddress.ip_network(network))) == expected
+
+
+def test_scan_network_shared_endpoint():
+    """Test that a scan queries several entities over a single UDP endpoint."""
+    from udsonip.discovery import _EntityProbe
+
+    async def scenario():
+        loop = asyncio.get_event_loop()
+        entities = []
+        first, _ = await loop.create_datagram_endpoint(
+            lambda: _FakeEntity(0x4001), local_addr=("127.0.0.1", 0)
+        )
+        entities.append(first)
+        port = first.get_extra_info("sockname")[1]
+        second, _ = await loop.create_datagram_endpoint(
+            lambda: _FakeEntity(0x4002), local_addr=("127.0.0.2", port)
+        )
+        entities.append(second)
+        try:
+            with patch("udsonip.discovery._UDP_DISCOVERY_PORT", port), patch(
+                "udsonip.discovery._EntityProbe", wraps=_EntityProbe
+            ) as mock_probe:
+                ecus = await scan_network_async("127.0.0.0/30", timeout=0.5)
+            assert mock_probe.call_count == 1
+            return ecus
+        finally:
+            for transport in entities:
+                transport.close()
+
+    ecus = asyncio.run(scenario())
+
+    assert [(ecu.ip, ecu.logical_address) for ecu in ecus] == [
+        ("127.0.0.1", 0x4001),
+        ("127.0.0.2", 0x4002),
+    ]
+
+
+def test_scan_network_fan_out():
+    """Test that max_concurrency=None sends every request before collecting responses."""
+
+    async def scenario():
+        loop = asyncio.get_event_loop()
+        entities = []
+        first, _ = await loop.create_datagram_endpoint(
+            lambda: _FakeEntity(0x4001), local_addr=("127.0.0.1", 0)
+        )
+        entities.append(first)
+        port = first.get_extra_info("sockname")[1]
+        # A VM-specific further action code must not fail the whole sweep
+        second, _ = await loop.create_datagram_endpoint(
+            lambda: _FakeEntity(0x4002, further_action_required=0x20),
+            local_addr=("127.0.0.2", port),
+        )
+        entities.append(second)
+        try:
+            with patch("udsonip.discovery._UDP_DISCOVERY_PORT", port), patch(
+                "udsonip.discovery._query_entity"
+            ) as mock_query_entity:
+                ecus = await scan_network_async("127.0.0.0/24", timeout=0.3, max_concurrency=None)
+            mock_query_entity.assert_not_called()
+            return ecus
+        finally:
+            for transport in entities:
+                transport.close()
+
+    ecus = asyncio.run(scenario())
+
+    assert [(ecu.ip, ecu.logical_address, ecu.further_action_required) for ecu in ecus] == [
+        ("127.0.0.1", 0x4001, 0x00),
+        ("127.0.0.2", 0x4002, 0x20),
+    ]
+
+
+def test_scan_network_fan_out_yields():
+    """Test that the fan-out sweep lets other tasks run while sending requests."""
+    import ipaddress
+    from udsonip.discovery import _fan_out_sweep
+
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def collect(*args):
+        return len(ticks)
+
+    async def scenario():
+        task = asyncio.ensure_future(ticker())
+        try:
+            with patch("udsonip.discovery._collect_responses", side_effect=collect):
+                return await _fan_out_sweep(ipaddress.ip_network("127.1.0.0/22"), 0.1, 0x03)
+        finally:
+            task.cancel()
+
+    # 1022 requests are sent in batches of 256
+    assert asyncio.run(scenario()) >= 3
+
+
+def test_announcement_protocol_flow_control():
+    """Test that drain() waits while the transport has paused writing."""
+    from udsonip.discovery import _AnnouncementProtocol
+
+    async def scenario():
+        protocol = _AnnouncementProtocol(asyncio.Queue())
+        await protocol.drain()
+
+        protocol.pause_writing()
+        drained = asyncio.ensure_future(protocol.drain())
+        await asyncio.sleep(0.01)
+        assert not drained.done()
+
+        protocol.resume_writing()
+        await asyncio.wait_for(drained, 1.0)
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("code", [0x00, 0x10, 0x20, 0xFF])
+def test_ecu_info_further_action_codes(code):
+    """Test that ISO and VM-specific further action codes are kept as integers."""
+    from udsonip.discovery import (
+        _ecu_info_from_announcement,
+        _parse_vehicle_identification_response,
+    )
+
+    announcement = _parse_vehicle_identification_response(_announcement_datagram(0x4001, code))
+    ecu = _ecu_info_from_announcement("127.0.0.1", announcement)
+
+    assert ecu.further_action_required == code
+    assert type(ecu.further_action_required) is int
+
+
+@patch("udsonip.discovery._query_entity")
+def test_scan_network_bounded_concurrency(mock_query_entity):
+    """Test that no more than max_concurrency probes are in flight at once."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_query_entity(probe, ip, timeout, protocol_version):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return ECUInfo(ip=ip, logical_address=0x1000)
+
+    mock_query_entity.side_effect = fake_query_entity
+
+    ecus = scan_network("10.0.0.0/26", timeout=0.5, max_concurrency=8)
+
+    assert peak == 8
+    assert [ecu.ip for ecu in ecus] == [f"10.0.0.{i}" for i in range(1, 63)]
+
+
+def test_scan_network_broadcast():
+    """Test that a broadcast scan collects responses within one listen window."""
+
+    async def scenario():
+        loop = asyncio.get_event_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _FakeEntity(0x4001), local_addr=("127.0.0.1", 0)
+        )
+        try:
+            port = transport.get_extra_info("sockname")[1]
+            with patch("udsonip.discovery._UDP_DISCOVERY_PORT", port), patch(
+                "udsonip.discovery._query_entity"
+            ) as mock_query_entity:
+                # A /32 network's broadcast address is the host itself
+                ecus = await scan_network_async("127.0.0.1/32", timeout=0.2, broadcast=True)
+            mock_query_entity.assert_not_called()
+            return ecus
+        finally:
+            transport.close()
+
+    ecus = asyncio.run(scenario())
+
+    assert [(ecu.ip, ecu.logical_address) for ecu in ecus] == [("127.0.0.1", 0x4001)]
+    assert get_entity("127.0.0.1") is ecus[0]
+
+
+def test_scan_network_broadcast_ipv6():
+    """Test that a broadcast scan rejects IPv6 networks."""
+    from udsonip.exceptions import DiscoveryError
+
+    with pytest.raises(DiscoveryError, match="IPv4"):
+        scan_network("fd00::/120", broadcast=True)
+
+
+@patch("udsonip.discovery._query_entity")
+def test_scan_network_max_misses(mock_query_entity):
+    """Test that a scan stops after max_misses consecutive hosts without an entity."""
+
+    async def fake_query_entity(probe, ip, timeout, protocol_version):
+        if ip in ("10.0.0.1", "10.0.0.3", "10.0.0.200"):
+            return ECUInfo(ip=ip, logical_address=0x1000)
+        return None
+
+    mock_query_entity.side_effect = fake_query_entity
+
+    ecus = scan_network("10.0.0.0/24", timeout=0.5, max_concurrency=1, max_misses=5)
+
+    assert [ecu.ip for ecu in ecus] == ["10.0.0.1", "10.0.0.3"]
+    # .1 - .3 (a miss in between resets the count), then .4 - .8 without an answer
+    assert mock_query_entity.call_count == 8
+
+
+def test_scan_network_too_large():
+    """Test that scan_network refuses networks too large to probe host by host."""
+    from udsonip.exceptions import DiscoveryError
+
+    with pytest.raises(DiscoveryError, match="too large"):
+        scan_network("fd00::/64")
+
+
+def test_scan_network_invalid():
+    """Test that scan_network rejects an invalid network."""
+    from udsonip.exceptions import DiscoveryError
+
+    with pytest.raises(DiscoveryError, match="Invalid network"):
+        scan_network("not-a-network")
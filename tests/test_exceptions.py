@@ -2,6 +2,8 @@
 Tests for udsonip exceptions.
 """
 
+import pickle
+import pytest
 from udsonip import exceptions
 
 
@@ -41,3 +43,33 @@ def test_ecu_not_found_error():
     """Test ECUNotFoundError."""
     exc = exceptions.ECUNotFoundError("ECU not found")
     assert isinstance(exc, exceptions.UDSonIPException)
+
+
+def test_ecu_not_found_error_name():
+    """Test ECUNotFoundError carries the ECU name."""
+    exc = exceptions.ECUNotFoundError(name="engine")
+    assert exc.name == "engine"
+    assert str(exc) == "ECU 'engine' not found in registry"
+    assert repr(exc) == "ECUNotFoundError('engine')"
+
+    exc = exceptions.ECUNotFoundError("custom message", name="engine")
+    assert exc.name == "engine"
+    assert str(exc) == "custom message"
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        exceptions.ECUNotFoundError(name="engine"),
+        exceptions.ECUNotFoundError("custom message", name="engine"),
+        exceptions.ECUNotFoundError("custom message"),
+        exceptions.ECUNotFoundError(),
+    ],
+)
+def test_ecu_not_found_error_pickle(exc):
+    """Test ECUNotFoundError keeps its name and message through pickling."""
+    restored = pickle.loads(pickle.dumps(exc))
+    assert type(restored) is exceptions.ECUNotFoundError
+    assert restored.name == exc.name
+    assert restored.args == exc.args
+    assert str(restored) == str(exc)
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import pytest
+import udsonip
+
+
+class TestLazyImports:
+    """Tests for the package's lazily resolved public API."""
+
+    def test_import_does_not_load_dependencies(self):
+        """Test that importing udsonip does not import doipclient or udsoncan."""
+        code = (
+            "import sys, udsonip; "
+            "print(any(m.split('.')[0] in ('doipclient', 'udsoncan') for m in sys.modules))"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], text=True)
+        assert output.strip() == "False"
+
+    def test_public_names_resolve(self):
+        """Test that every name in __all__ can be accessed."""
+        from udsonip.client import UdsOnIpClient
+
+        assert udsonip.UdsOnIpClient is UdsOnIpClient
+        for name in udsonip.__all__:
+            assert getattr(udsonip, name) is not None
+        assert set(udsonip.__all__) <= set(dir(udsonip))
+
+    def test_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError, match="no attribute 'missing'"):
+            udsonip.missing
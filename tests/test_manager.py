@@ -1,7 +1,39 @@
+import asyncio
+import gc
+import threading
+import time
+import weakref
 import pytest
-from unittest.mock import patch, MagicMock
+from contextlib import contextmanager
+from unittest.mock import patch, AsyncMock, MagicMock
+from doipclient import DoIPClient
+from udsoncan import Request, services
 from udsonip.manager import DoIPManager
 from udsonip.exceptions import ECUNotFoundError, ConnectionError
+from tests.test_connection import _FakeGateway
+
+
+@contextmanager
+def _gateway(**kwargs):
+    """Run a fake DoIP gateway on a background loop and point DoIPManager at it."""
+    loop = asyncio.new_event_loop()
+    gateway = _FakeGateway(**kwargs)
+    loop.run_until_complete(gateway.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def doip_client(**client_kwargs):
+        client_kwargs["tcp_port"] = gateway.port
+        return DoIPClient(**client_kwargs)
+
+    try:
+        with patch("udsonip.manager.DoIPClient", doip_client):
+            yield gateway
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(gateway.stop())
+        loop.close()
 
 
 @pytest.fixture
@@ -33,6 +65,20 @@ class TestDoIPManager:
         manager.add_ecu("transmission", 0x00E1)
         assert manager.list_ecus() == {"engine": 0x00E0, "transmission": 0x00E1}
 
+    def test_list_ecus_view(self, manager):
+        """Test that list_ecus returns a read-only live view unless a copy is asked for."""
+        ecus = manager.list_ecus()
+        assert manager.list_ecus() is ecus
+        with pytest.raises(TypeError):
+            ecus["engine"] = 0x00E0
+
+        snapshot = manager.list_ecus(copy=True)
+        manager.add_ecu("engine", 0x00E0)
+        assert ecus == {"engine": 0x00E0}
+        assert snapshot == {}
+        snapshot["abs"] = 0x00E2
+        assert "abs" not in manager.list_ecus()
+
     def test_remove_ecu(self, manager):
         """Test removing an ECU."""
         manager.add_ecu("engine", 0x00E0)
@@ -47,12 +93,10 @@ class TestDoIPManager:
         """Test that removing an ECU also clears the cache."""
         manager.add_ecu("engine", 0x00E0)
         # Pre-populate cache
-        manager._connections["engine"] = MagicMock()
-        manager._clients["engine"] = MagicMock()
+        manager._pool["engine"] = (MagicMock(), MagicMock())
 
         manager.remove_ecu("engine")
-        assert "engine" not in manager._connections
-        assert "engine" not in manager._clients
+        assert "engine" not in manager._pool
 
     @patch("udsonip.manager.UDSClient")
     @patch("udsonip.manager.UdsOnIpConnection")
@@ -62,14 +106,17 @@ class TestDoIPManager:
 
         with manager.ecu("engine") as ecu:
             assert ecu == MockUDSClient.return_value
-            MockUdsOnIpConnection.assert_called_once_with(manager._doip, 0x00E0)
+            MockUdsOnIpConnection.assert_called_once_with(
+                manager._doip, 0x00E0, reactor=manager._reactor
+            )
             MockUDSClient.assert_called_once_with(MockUdsOnIpConnection.return_value)
 
     def test_ecu_not_found(self, manager):
         """Test that ECUNotFoundError is raised for non-existent ECU."""
-        with pytest.raises(ECUNotFoundError):
+        with pytest.raises(ECUNotFoundError, match="'non_existent' not found") as exc_info:
             with manager.ecu("non_existent"):
                 pass
+        assert exc_info.value.name == "non_existent"
 
     @patch("udsonip.manager.UDSClient")
     @patch("udsonip.manager.UdsOnIpConnection")
@@ -89,15 +136,63 @@ class TestDoIPManager:
             pass
 
         # Get the mocked connection to check if close is called
-        mock_connection = manager._connections["engine"]
+        mock_connection, _ = manager._pool["engine"]
 
         manager.close()
 
         mock_connection.close.assert_called_once()
         manager._doip.close.assert_called_once()
         assert not manager._connected
-        assert not manager._connections
-        assert not manager._clients
+        assert not manager._pool
+
+    @patch("udsonip.manager.UDSClient")
+    @patch("udsonip.manager.UdsOnIpConnection")
+    def test_release_on_garbage_collection(self, MockUdsOnIpConnection, MockUDSClient):
+        """Test that an unclosed manager releases its connections when collected."""
+        with patch("udsonip.manager.DoIPClient") as MockDoIPClient:
+            manager = DoIPManager("192.168.1.1")
+            manager.add_ecu("engine", 0x00E0)
+            manager.switch_to("engine")
+            finalizer = manager._finalizer
+
+            del manager
+            gc.collect()
+
+        assert not finalizer.alive
+        MockUdsOnIpConnection.return_value.close.assert_called_once()
+        MockDoIPClient.return_value.close.assert_called_once()
+
+    @patch("udsonip.manager.UDSClient")
+    @patch("udsonip.manager.UdsOnIpConnection")
+    def test_release_on_garbage_collection_with_keep_alive(
+        self, MockUdsOnIpConnection, MockUDSClient
+    ):
+        """Test that collecting an unclosed manager also stops its keep-alive thread."""
+        with patch("udsonip.manager.DoIPClient") as MockDoIPClient:
+            manager = DoIPManager("192.168.1.1", keep_alive=True, keep_alive_interval=0.01)
+            manager.add_ecu("engine", 0x00E0)
+            manager.switch_to("engine")
+            finalizer = manager._finalizer
+            thread = manager._keep_alive_thread
+
+            del manager
+            gc.collect()
+            thread.join(timeout=2.0)
+
+        assert not finalizer.alive
+        assert not thread.is_alive()
+        MockDoIPClient.return_value.close.assert_called_once()
+
+    def test_close_twice(self, manager):
+        """Test that a second close() does not release the connection again."""
+        manager.add_ecu("engine", 0x00E0)
+        manager._ensure_connected()
+        doip = manager._doip
+
+        manager.close()
+        manager.close()
+
+        doip.close.assert_called_once()
 
     @patch("udsonip.manager.DoIPManager._ensure_connected")
     def test_ensure_connected_failure(self, mock_ensure_connected):
@@ -135,16 +230,155 @@ class TestDoIPManager:
         client2 = manager._get_client("engine")
         assert client2 == client1
         MockUDSClient.assert_called_once()  # Should still be called only once
+        assert manager._pool["engine"] == (MockUdsOnIpConnection.return_value, client1)
+
+    @patch("udsonip.manager.UDSClient")
+    @patch("udsonip.manager.UdsOnIpConnection")
+    def test_ecus_share_doip_client(self, MockUdsOnIpConnection, MockUDSClient):
+        """Test that all ECUs are reached through a single DoIP connection."""
+        with patch("udsonip.manager.DoIPClient") as MockDoIPClient:
+            manager = DoIPManager("192.168.1.1")
+            manager.add_ecu("engine", 0x00E0)
+            manager.add_ecu("transmission", 0x00E1)
+
+            manager.switch_to("engine")
+            manager.switch_to("transmission")
+
+            MockDoIPClient.assert_called_once()
+            assert [c.args for c in MockUdsOnIpConnection.call_args_list] == [
+                (MockDoIPClient.return_value, 0x00E0),
+                (MockDoIPClient.return_value, 0x00E1),
+            ]
+            # ...and wait for data through a single shared reactor
+            reactors = {c.kwargs["reactor"] for c in MockUdsOnIpConnection.call_args_list}
+            assert reactors == {manager._reactor}
+            manager.close()
+
+    @patch("udsonip.manager.UDSClient")
+    @patch("udsonip.manager.UdsOnIpConnection")
+    def test_prewarm(self, MockUdsOnIpConnection, MockUDSClient):
+        """Test that prewarm connects once and pools a client for every ECU."""
+        with patch("udsonip.manager.DoIPClient") as MockDoIPClient:
+            manager = DoIPManager("192.168.1.1")
+            manager.add_ecu("engine", 0x00E0)
+            manager.add_ecu("transmission", 0x00E1)
+            manager.add_ecu("abs", 0x00E2)
+
+            manager.prewarm()
+
+            MockDoIPClient.assert_called_once()
+            assert set(manager._pool) == {"engine", "transmission", "abs"}
+            assert MockUdsOnIpConnection.call_count == 3
+
+            # Served from the pool afterwards
+            manager.switch_to("engine")
+            assert MockUDSClient.call_count == 3
+            manager.close()
+
+    @patch("udsonip.manager.UDSClient")
+    @patch("udsonip.manager.UdsOnIpConnection")
+    def test_keep_alive(self, MockUdsOnIpConnection, MockUDSClient):
+        """Test that a single thread keeps every ECU in use alive until close()."""
+        with patch("udsonip.manager.DoIPClient") as MockDoIPClient:
+            manager = DoIPManager("192.168.1.1", keep_alive=True, keep_alive_interval=0.01)
+            manager.add_ecu("engine", 0x00E0)
+            manager.add_ecu("transmission", 0x00E1)
+            manager.add_ecu("abs", 0x00E2)
+            assert manager._keep_alive_thread is None  # not started before first use
+
+            manager.switch_to("engine")
+            manager.switch_to("transmission")
+            thread = manager._keep_alive_thread
+
+            send = MockDoIPClient.return_value.send_doip_message
+            deadline = time.monotonic() + 2.0
+            while send.call_count < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            manager.close()
+
+            messages = [c.args[0] for c in send.call_args_list]
+            assert {(m.target_address, m.user_data) for m in messages} == {
+                (0x00E0, b"\x3e\x80"),
+                (0x00E1, b"\x3e\x80"),
+            }
+            # Only the request is written, acknowledgements are not read here
+            MockDoIPClient.return_value.send_diagnostic_to_address.assert_not_called()
+            assert not thread.is_alive()
+            assert manager._keep_alive_thread is None
+
+    def test_keep_alive_during_requests(self):
+        """Test that requests from several threads get their responses while keep-alive fires."""
+        errors = []
+
+        def read(client, address):
+            try:
+                for _ in range(20):
+                    request = Request(services.ReadDataByIdentifier, data=b"\xf1\x90")
+                    response = client.send_request(request)
+                    assert response.data == b"\xf1\x90" + bytes([address])
+            except Exception as e:
+                errors.append(e)
+
+        with _gateway(delays={0x00E0: 0.005, 0x00E1: 0.01}):
+            manager = DoIPManager("127.0.0.1", keep_alive=True, keep_alive_interval=0.001)
+            manager.add_ecu("engine", 0x00E0)
+            manager.add_ecu("transmission", 0x00E1)
+            readers = [
+                threading.Thread(target=read, args=(manager.switch_to(name), address))
+                for name, address in manager.list_ecus().items()
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+            manager.close()
+
+        assert errors == []
+
+    @patch("udsonip.manager.UDSClient")
+    @patch("udsonip.manager.UdsOnIpConnection")
+    def test_keep_alive_thread_does_not_hold_manager(self, MockUdsOnIpConnection, MockUDSClient):
+        """Test that a running keep-alive thread does not keep the manager alive."""
+        with patch("udsonip.manager.DoIPClient"):
+            manager = DoIPManager("192.168.1.1", keep_alive=True, keep_alive_interval=0.01)
+            manager.add_ecu("engine", 0x00E0)
+            manager.switch_to("engine")
+            assert manager._keep_alive_thread.is_alive()
+            ref = weakref.ref(manager)
+
+            del manager
+            gc.collect()
+
+        assert ref() is None
+
+    def test_prewarm_unknown_ecu(self, manager):
+        """Test that prewarm rejects unregistered ECUs."""
+        with pytest.raises(ECUNotFoundError):
+            manager.prewarm(["non_existent"])
 
     def test_ecu_context_exception(self, manager):
         """Test that exceptions are re-raised with context from the ecu context manager."""
         manager.add_ecu("engine", 0x00E0)
 
-        with pytest.raises(
-            ValueError, match="Error communicating with ECU 'engine': Test exception"
-        ):
+        error = ValueError("Test exception")
+        with pytest.raises(ValueError) as exc_info:
             with manager.ecu("engine"):
-                raise ValueError("Test exception")
+                raise error
+
+        assert exc_info.value is error
+        assert str(error) == "Test exception"
+        assert error.__notes__ == ["Error communicating with ECU 'engine'"]
+
+    def test_ecu_context_exception_any_signature(self, manager):
+        """Test that exceptions not constructible from a message are re-raised intact."""
+        manager.add_ecu("engine", 0x00E0)
+
+        with pytest.raises(UnicodeDecodeError) as exc_info:
+            with manager.ecu("engine"):
+                b"\xff".decode("utf-8")
+
+        assert exc_info.value.__notes__ == ["Error communicating with ECU 'engine'"]
 
     @patch("udsonip.manager.UdsOnIpConnection")
     def test_close_with_connection_error(self, MockUdsOnIpConnection, manager):
@@ -152,7 +386,7 @@ class TestDoIPManager:
         manager.add_ecu("engine", 0x00E0)
         with manager.ecu("engine"):
             pass
-        manager._connections["engine"].close.side_effect = Exception("Close failed")
+        manager._pool["engine"][0].close.side_effect = Exception("Close failed")
 
         manager.close()
         manager._doip.close.assert_called_once()
@@ -168,3 +402,64 @@ class TestDoIPManager:
         assert not manager._connected
 
         manager._doip.close.assert_called_once()
+
+    @patch("udsonip.manager.AsyncUdsOnIpConnection")
+    def test_gather_read_did(self, MockAsyncConnection):
+        """Test that gather_read_did reads from all ECUs and collects errors per ECU."""
+        manager = DoIPManager("192.168.1.1", async_client_logical_address=0x0E01)
+        manager.add_ecu("engine", 0x00E0)
+        manager.add_ecu("abs", 0x00E2)
+
+        async def read(address, did):
+            if address == 0x00E2:
+                raise TimeoutError("No response")
+            return f"{address:#x}:{did:#x}"
+
+        connection = MockAsyncConnection.return_value
+        connection.open = AsyncMock()
+        connection.close = AsyncMock()
+        connection.read_data_by_identifier = AsyncMock(side_effect=read)
+
+        async def scenario():
+            try:
+                return await manager.gather_read_did(0xF190)
+            finally:
+                await manager.aclose()
+
+        results = asyncio.run(scenario())
+
+        assert results["engine"] == "0xe0:0xf190"
+        assert isinstance(results["abs"], TimeoutError)
+        assert MockAsyncConnection.call_args.kwargs["client_logical_address"] == 0x0E01
+        connection.open.assert_awaited_once()
+        connection.close.assert_awaited_once()
+
+    @patch("udsonip.manager.AsyncUdsOnIpConnection")
+    def test_gather_read_did_shares_connection(self, MockAsyncConnection):
+        """Test that by default gather_read_did reuses the activated synchronous connection."""
+
+        async def scenario(manager):
+            with manager.ecu("engine") as ecu:
+                ecu.tester_present()
+            return await manager.gather_read_did(0xF190, ["engine", "transmission", "engine"])
+
+        with _gateway(delays={0x00E0: 0.05}):
+            with DoIPManager("127.0.0.1") as manager:
+                manager.add_ecu("engine", 0x00E0)
+                manager.add_ecu("transmission", 0x00E1)
+                results = asyncio.run(scenario(manager))
+
+        assert list(results) == ["engine", "transmission"]
+        assert results["engine"].data == b"\xf1\x90\xe0"
+        assert results["transmission"].data == b"\xf1\x90\xe1"
+        MockAsyncConnection.assert_not_called()
+
+    def test_async_client_logical_address_must_differ(self):
+        """Test that a second connection is never set up with the same tester address."""
+        with pytest.raises(ValueError, match="must differ from client_logical_address"):
+            DoIPManager("192.168.1.1", async_client_logical_address=0x0E00)
+
+    def test_gather_read_did_unknown_ecu(self, manager):
+        """Test that gather_read_did rejects unregistered ECUs."""
+        with pytest.raises(ECUNotFoundError):
+            asyncio.run(manager.gather_read_did(0xF190, ["non_existent"]))
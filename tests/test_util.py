@@ -0,0 +1,28 @@
+from unittest.mock import Mock
+from udsonip._util import _Lazy, _hex_addr
+
+
+class TestHexAddr:
+    """Tests for the logical address formatter."""
+
+    def test_format(self):
+        """Test that addresses are formatted like f"{addr:#x}"."""
+        assert _hex_addr(0x00E0) == "0xe0"
+        assert _hex_addr(0x0E00) == "0xe00"
+
+    def test_cached(self):
+        """Test that repeated lookups return the cached string."""
+        assert _hex_addr(0x00E1) is _hex_addr(0x00E1)
+
+
+class TestLazy:
+    """Tests for the deferred log argument."""
+
+    def test_deferred_until_str(self):
+        """Test that the wrapped call only runs when converted to a string."""
+        func = Mock(return_value="5001")
+        lazy = _Lazy(func, 1, 2)
+        func.assert_not_called()
+
+        assert "%s" % lazy == "5001"
+        func.assert_called_once_with(1, 2)
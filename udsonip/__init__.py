@@ -9,10 +9,9 @@ __version__ = "0.2.0"
 __author__ = "Sirius Wu"
 __license__ = "MIT"
 
-from .connection import UdsOnIpConnection
-from .client import UdsOnIpClient
-from .manager import DoIPManager
-from .discovery import discover_ecus, get_entity, ECUInfo
+import importlib
+from typing import Any, List
+
 from .exceptions import (
     UDSonIPException,
     ConnectionError,
@@ -22,12 +21,49 @@ from .exceptions import (
     ECUNotFoundError,
 )
 
+# Public names resolved on first access (PEP 562), so that "import udsonip" does not
+# load doipclient and udsoncan until they are actually needed
+_LAZY_IMPORTS = {
+    "UdsOnIpConnection": "connection",
+    "AsyncUdsOnIpConnection": "connection",
+    "UdsOnIpClient": "client",
+    "DoIPManager": "manager",
+    "discover_ecus": "discovery",
+    "discover_ecus_async": "discovery",
+    "get_entity": "discovery",
+    "get_entity_async": "discovery",
+    "scan_network": "discovery",
+    "scan_network_async": "discovery",
+    "invalidate_discovery_cache": "discovery",
+    "ECUInfo": "discovery",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 __all__ = [
     "UdsOnIpConnection",
+    "AsyncUdsOnIpConnection",
     "UdsOnIpClient",
     "DoIPManager",
     "discover_ecus",
+    "discover_ecus_async",
     "get_entity",
+    "get_entity_async",
+    "scan_network",
+    "scan_network_async",
+    "invalidate_discovery_cache",
     "ECUInfo",
     "UDSonIPException",
     "ConnectionError",
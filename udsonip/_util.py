@@ -0,0 +1,45 @@
+"""
+Internal helpers shared across udsonip modules.
+"""
+
+import functools
+from typing import Any, Callable
+
+
+@functools.lru_cache(maxsize=1024)
+def _hex_addr(address: int) -> str:
+    """
+    Format a logical address as a hex string (e.g. ``0xe0``).
+
+    Only a handful of logical addresses are used on a given vehicle, so the
+    formatted strings are memoized instead of being rebuilt for every message.
+
+    Args:
+        address: Logical address to format
+
+    Returns:
+        The address formatted with ``'#x'``
+    """
+    return f"{address:#x}"
+
+
+class _Lazy:
+    """
+    Defer a call until the object is converted to a string.
+
+    Used for expensive logging arguments (e.g. ``payload.hex``), so that the
+    string is only built when the log record is actually emitted.
+
+    Args:
+        func: Callable producing the value
+        *args: Arguments passed to func
+    """
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args))
@@ -2,13 +2,18 @@
 Enhanced UDS-on-IP client with simplified API.
 """
 
-from typing import Optional, Union
+import struct
+from typing import Any, Dict, Iterable, Optional, Union
 from doipclient import DoIPClient
 from udsoncan.client import Client as UDSClient
 from udsoncan import services
+from ._util import _hex_addr
 from .connection import UdsOnIpConnection
 from . import exceptions
 
+# reportDTCByStatusMask record: 3-byte DTC followed by its status byte
+_DTC_RECORD = struct.Struct("!BHB")
+
 
 class UdsOnIpClient:
     """
@@ -36,6 +41,22 @@ class UdsOnIpClient:
         >>> client.close()
     """
 
+    __slots__ = (
+        "_auto_reconnect",
+        "_keep_alive",
+        "_doip",
+        "_connection",
+        "_uds",
+        "_closed",
+        "_tester_present",
+        "_read_data_by_identifier",
+        "_write_data_by_identifier",
+        "__weakref__",
+    )
+
+    # Routine control type -> UDS client method (service 0x31 subfunctions)
+    _ROUTINE_DISPATCH = {1: "start_routine", 2: "stop_routine", 3: "get_routine_result"}
+
     def __init__(
         self,
         ecu_ip: str,
@@ -51,6 +72,7 @@ class UdsOnIpClient:
         # Store configuration
         self._auto_reconnect = auto_reconnect
         self._keep_alive = keep_alive
+        self._closed = False
 
         try:
             # Create DoIP client
@@ -71,11 +93,16 @@ class UdsOnIpClient:
             # Create UDS client
             self._uds = UDSClient(self._connection, **kwargs)
 
+            # Bind the services used in polling loops once
+            self._tester_present = self._uds.tester_present
+            self._read_data_by_identifier = self._uds.read_data_by_identifier
+            self._write_data_by_identifier = self._uds.write_data_by_identifier
+
             # Connect
             self._connection.open()
         except Exception as e:
             raise exceptions.ConnectionError(
-                f"Failed to connect to {ecu_ip}:{ecu_address:#x}"
+                f"Failed to connect to {ecu_ip}:{_hex_addr(ecu_address)}"
             ) from e
 
     @property
@@ -98,9 +125,8 @@ class UdsOnIpClient:
         try:
             self._connection.target_address = value
         except exceptions.AddressSwitchError as e:
-            raise exceptions.AddressSwitchError(
-                f"Failed to switch address to {value:#x}: {e}"
-            ) from e
+            shown = _hex_addr(value) if isinstance(value, int) else repr(value)
+            raise exceptions.AddressSwitchError(f"Failed to switch address to {shown}: {e}") from e
 
     @property
     def uds(self) -> UDSClient:
@@ -108,12 +134,21 @@ class UdsOnIpClient:
         return self._uds
 
     def close(self):
-        """Close the connection to the ECU."""
-        try:
-            self._connection.close()
-            self._doip.close()
-        except Exception as e:
-            raise exceptions.ConnectionError("Error closing connection") from e
+        """
+        Close the connection to the ECU.
+
+        Calling close() more than once has no effect. Each shutdown step is attempted
+        even if a previous one fails; failures are logged as warnings.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        for step in (self._connection.close, self._doip.close):
+            try:
+                step()
+            except Exception as e:
+                self._connection.logger.warning("Error closing connection: %s", e)
 
     def __enter__(self):
         """Context manager entry."""
@@ -135,7 +170,7 @@ class UdsOnIpClient:
         Returns:
             Service response
         """
-        return self._uds.tester_present(suppress_response=suppress_response)
+        return self._tester_present(suppress_response=suppress_response)
 
     def read_data_by_identifier(self, did: Union[int, list]):
         """
@@ -147,7 +182,28 @@ class UdsOnIpClient:
         Returns:
             Service response with .data attribute
         """
-        return self._uds.read_data_by_identifier(did)
+        return self._read_data_by_identifier(did)
+
+    def read_data_by_identifiers(self, dids: Iterable[int]) -> Dict[int, Any]:
+        """
+        Read several data identifiers with a single request (service 0x22).
+
+        A codec for every DID must be configured in the UDS client's
+        ``data_identifiers`` config (pass ``config=...`` to the constructor).
+
+        Args:
+            dids: Data identifiers to read
+
+        Returns:
+            Dictionary mapping each DID to its decoded value
+
+        Example:
+            >>> values = client.read_data_by_identifiers([0xF190, 0xF195])
+            >>> print(f"VIN: {values[0xF190]}")
+        """
+        response = self._read_data_by_identifier(list(dids))
+        values: Dict[int, Any] = response.service_data.values
+        return values
 
     def write_data_by_identifier(self, did: int, data: bytes):
         """
@@ -160,7 +216,7 @@ class UdsOnIpClient:
         Returns:
             Service response
         """
-        return self._uds.write_data_by_identifier(did, data)
+        return self._write_data_by_identifier(did, data)
 
     def read_dtc_information(self, dtc_status_mask: int = 0xFF):
         """
@@ -176,6 +232,39 @@ class UdsOnIpClient:
             services.ReadDTCInformation.Subfunction.reportDTCByStatusMask, dtc_status_mask
         )
 
+    def read_dtc_status(self, dtc_status_mask: int = 0xFF) -> Dict[int, int]:
+        """
+        Read the DTCs matching a status mask as a plain mapping (service 0x19).
+
+        Unlike read_dtc_information(), the response is not interpreted into udsoncan
+        Dtc objects. The 4-byte records are unpacked in a single struct pass, which
+        is much cheaper for ECUs reporting hundreds of DTCs.
+
+        Args:
+            dtc_status_mask: DTC status mask
+
+        Returns:
+            Dictionary mapping each DTC to its status byte
+
+        Example:
+            >>> for dtc, status in client.read_dtc_status(0x08).items():
+            ...     print(f"{dtc:06X}: {status:#04x}")
+        """
+        request = services.ReadDTCInformation.make_request(
+            services.ReadDTCInformation.Subfunction.reportDTCByStatusMask,
+            status_mask=dtc_status_mask,
+        )
+        response = self._uds.send_request(request)
+        # Only None when the positive response is suppressed, which is never requested here
+        assert response is not None and response.data is not None
+
+        # Subfunction echo and DTC status availability mask precede the records
+        records = response.data[2:]
+        records = records[: len(records) - len(records) % _DTC_RECORD.size]
+        return {
+            (high << 16) | low: status for high, low, status in _DTC_RECORD.iter_unpack(records)
+        }
+
     def clear_dtc(self, group: int = 0xFFFFFF):
         """
         Clear diagnostic trouble codes (service 0x14).
@@ -239,13 +328,11 @@ class UdsOnIpClient:
 
         Returns:
             Service response
+
+        Raises:
+            ValueError: If control_type is not 1, 2 or 3
         """
-        return (
-            self._uds.start_routine(routine_id, data)
-            if control_type == 1
-            else (
-                self._uds.stop_routine(routine_id, data)
-                if control_type == 2
-                else self._uds.get_routine_result(routine_id, data)
-            )
-        )
+        method = self._ROUTINE_DISPATCH.get(control_type)
+        if method is None:
+            raise ValueError(f"Invalid routine control type: {control_type}")
+        return getattr(self._uds, method)(routine_id, data)
@@ -2,11 +2,152 @@
 Enhanced DoIP connection for UDS communication with dynamic target address support.
 """
 
-from typing import Optional
+import asyncio
+import collections
+import logging
+import selectors
+import socket
+import ssl
+import threading
+import time
+from typing import Deque, Dict, Optional, Tuple, Union
+from udsoncan import Request, Response, services
 from udsoncan.connections import BaseConnection
+from udsoncan.exceptions import InvalidResponseException, NegativeResponseException
 from doipclient import DoIPClient
+from doipclient.client import Parser
+from doipclient.constants import A_PROCESSING_TIME
+from doipclient.messages import (
+    AliveCheckRequest,
+    AliveCheckResponse,
+    DiagnosticMessage,
+    DiagnosticMessageNegativeAcknowledgement,
+    GenericDoIPNegativeAcknowledge,
+    RoutingActivationRequest,
+    RoutingActivationResponse,
+    payload_message_to_type,
+)
+from ._util import _Lazy, _hex_addr
 from .exceptions import AddressSwitchError
 
+# Smallest timeout handed to DoIPClient once the socket is known to be readable
+_MIN_READ_TIME = 0.001
+
+# Responses kept per ECU when they are read by a connection waiting for another ECU
+_MAX_PENDING = 16
+
+
+class _Reactor:
+    """
+    Selector and I/O coordination for the connections sharing a DoIP client.
+
+    DoIPManager reaches every ECU through a single DoIPClient, so its connections
+    share one reactor instead of each creating its own epoll/kqueue instance. The
+    reactor also serializes DoIPClient calls between threads (io_lock) and lets a
+    single connection read the socket at a time; responses it reads for other ECUs
+    are handed over to the connections waiting for them.
+    """
+
+    __slots__ = ("_selector", "_lock", "io_lock", "_frames", "_pending", "_reading")
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self.io_lock = threading.Lock()
+        # Guards _pending and _reading, notified whenever either changes
+        self._frames = threading.Condition(threading.Lock())
+        self._pending: Dict[int, Deque[Union[bytes, Exception]]] = {}
+        self._reading = False
+
+    def claim(self, address: int, timeout: float) -> Tuple[Optional[bytes], bool]:
+        """
+        Wait for a response from address read by another connection, or for the
+        socket to be free to read.
+
+        Args:
+            address: Logical address of the ECU a response is expected from
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            (frame, False) when a response was handed over, (None, True) when the
+            caller may read the socket and must call release() afterwards, and
+            (None, False) when the timeout expired
+
+        Raises:
+            IOError: The ECU's request was rejected with a negative acknowledge
+        """
+        deadline = time.monotonic() + timeout
+        with self._frames:
+            while True:
+                pending = self._pending.get(address)
+                if pending:
+                    frame = pending.popleft()
+                    if isinstance(frame, Exception):
+                        raise frame
+                    return frame, False
+                if not self._reading:
+                    self._reading = True
+                    return None, True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, False
+                self._frames.wait(remaining)
+
+    def release(self):
+        """Give up the socket after a successful claim()."""
+        with self._frames:
+            self._reading = False
+            self._frames.notify_all()
+
+    def stash(self, address: int, frame: Union[bytes, Exception]):
+        """
+        Hand a response (or the error to raise) over to the connection of an ECU.
+
+        Args:
+            address: Logical address of the ECU that sent the response
+            frame: Diagnostic payload, or the exception claim() raises for it
+        """
+        with self._frames:
+            pending = self._pending.get(address)
+            if pending is None:
+                pending = self._pending[address] = collections.deque(maxlen=_MAX_PENDING)
+            pending.append(frame)
+            self._frames.notify_all()
+
+    def discard(self, address: int):
+        """Drop the responses pending for an ECU."""
+        with self._frames:
+            self._pending.pop(address, None)
+
+    def wait_readable(self, sock: socket.socket, timeout: Optional[float]) -> bool:
+        """
+        Wait until sock has data to read.
+
+        Args:
+            sock: Socket to wait for
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            False if the timeout expired without data, True otherwise
+        """
+        with self._lock:
+            # The selector keys by file descriptor, and the socket DoIPClient opens
+            # on reconnect usually gets the closed one's descriptor back, so compare
+            # the socket objects themselves
+            key = self._selector.get_map().get(sock.fileno())
+            if key is None or key.fileobj is not sock:
+                # DoIPClient replaces its socket on reconnect, drop the old one
+                for stale in list(self._selector.get_map().values()):
+                    self._selector.unregister(stale.fileobj)
+                self._selector.register(sock, selectors.EVENT_READ)
+
+        return bool(self._selector.select(timeout))
+
+    def close(self):
+        """Release the selector."""
+        with self._lock:
+            self._selector.close()
+
 
 class UdsOnIpConnection(BaseConnection):
     """
@@ -20,6 +161,8 @@ class UdsOnIpConnection(BaseConnection):
         doip_client: DoIPClient instance to use for communication
         target_address: Optional target logical address. If not provided, uses
                        the address from doip_client
+        reactor: Optional reactor shared with other connections using the same
+                 doip_client. If not provided, the connection creates its own.
 
     Example:
         >>> from doipclient import DoIPClient
@@ -29,11 +172,33 @@ class UdsOnIpConnection(BaseConnection):
         >>> conn.target_address = 0x00E1
     """
 
-    def __init__(self, doip_client: DoIPClient, target_address: Optional[int] = None):
+    # BaseConnection still provides a __dict__ (name, logger, ...); the slots keep
+    # the attributes touched on every request out of it.
+    __slots__ = (
+        "_doip",
+        "_send",
+        "_read",
+        "_target_address",
+        "_opened",
+        "_reactor",
+        "_owns_reactor",
+    )
+
+    def __init__(
+        self,
+        doip_client: DoIPClient,
+        target_address: Optional[int] = None,
+        reactor: Optional[_Reactor] = None,
+    ):
         BaseConnection.__init__(self, name="UdsOnIp")
         self._doip = doip_client
+        # Bound once; these are called for every request/response
+        self._send = doip_client.send_doip_message
+        self._read = doip_client.read_doip
         self._target_address = target_address or doip_client._ecu_logical_address
         self._opened = False
+        self._reactor = reactor
+        self._owns_reactor = reactor is None
 
     @property
     def target_address(self) -> int:
@@ -48,12 +213,17 @@ class UdsOnIpConnection(BaseConnection):
         Args:
             value: New target logical address (e.g., 0x00E0, 0x00E1)
         """
-        if not 0x0000 <= value <= 0xFFFF:
-            raise AddressSwitchError(
-                f"Invalid logical address: {value:#x}. Must be a 16-bit integer."
-            )
+        if value == self._target_address:
+            return
+        # A single mask test rejects both negative and oversized addresses
+        if not isinstance(value, int) or value & ~0xFFFF:
+            shown = _hex_addr(value) if isinstance(value, int) else repr(value)
+            raise AddressSwitchError(f"Invalid logical address: {shown}. Must be a 16-bit integer.")
         self._target_address = value
-        self.logger.info(f"Target address switched to {value:#x}")
+        # Ping-ponging between ECUs switches among a few addresses; reuse their
+        # memoized hex strings rather than formatting the address on every switch
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Target address switched to %s", _hex_addr(value))
 
     def open(self):
         """
@@ -72,6 +242,9 @@ class UdsOnIpConnection(BaseConnection):
         if self._opened:
             self._opened = False
             self.logger.info("UdsOnIpConnection closed")
+        if self._owns_reactor and self._reactor is not None:
+            self._reactor.close()
+            self._reactor = None
 
     def specific_send(self, payload: bytes):
         """
@@ -80,43 +253,521 @@ class UdsOnIpConnection(BaseConnection):
         Args:
             payload: UDS message payload to send
         """
+        # payload.hex() allocates a string as long as the payload; only run it if the
+        # record is emitted
         self.logger.debug(
-            f"Sending {len(payload)} bytes to {self._target_address:#x}: {payload.hex()}"
+            "Sending %d bytes to %#x: %s", len(payload), self._target_address, _Lazy(payload.hex)
         )
 
-        # Use send_diagnostic_to_address for dynamic addressing
-        self._doip.send_diagnostic_to_address(self._target_address, bytearray(payload))
+        # Only the request is written here: the gateway's acknowledgement is skipped by
+        # whichever connection reads the socket next. DoIPClient only concatenates the
+        # payload after the DoIP header, so any bytes-like object can be passed through
+        # without copying it into a bytearray first.
+        message = DiagnosticMessage(
+            self._doip._client_logical_address, self._target_address, payload
+        )
+        with self._shared_reactor().io_lock:
+            self._send(message)
 
     def specific_wait_frame(self, timeout: Optional[float] = None) -> Optional[bytes]:
         """
         Wait for and receive a UDS response frame.
 
+        The DoIPClient may be shared by several connections (one per ECU behind a
+        gateway), so responses are matched against this connection's target address
+        rather than the client's ECU address, which is never modified. Responses read
+        for other ECUs are handed over to their connections through the reactor.
+
         Args:
-            timeout: Maximum time to wait for response in seconds
+            timeout: Maximum time to wait for response in seconds. Defaults to
+                     DoIPClient's A_PROCESSING_TIME when None.
 
         Returns:
             Received frame data or None if timeout
+
+        Raises:
+            IOError: The gateway rejected the request with a negative acknowledge
         """
+        if timeout is None:
+            timeout = A_PROCESSING_TIME
+        deadline = time.monotonic() + timeout
+        reactor = self._shared_reactor()
         try:
-            # Receive diagnostic message
-            response = self._doip.receive_diagnostic(timeout=timeout)
-            if response:
-                self.logger.debug(f"Received {len(response)} bytes: {response.hex()}")
-                return bytes(response)
-            return None
+            response, reading = reactor.claim(self._target_address, timeout)
+            if reading:
+                try:
+                    response = self._read_response(reactor, deadline)
+                finally:
+                    reactor.release()
+            if response is None:
+                return None
+            self.logger.debug("Received %d bytes: %s", len(response), _Lazy(response.hex))
+            # udsoncan expects an immutable frame; only copy when it is not one already
+            return response if type(response) is bytes else bytes(response)
         except Exception as e:
-            self.logger.error(f"Error receiving frame: {e}")
+            self.logger.error("Error receiving frame: %s", e)
             raise
 
+    def _read_response(self, reactor: _Reactor, deadline: float) -> Optional[bytes]:
+        """
+        Read DoIP messages until the target ECU responds or the deadline passes.
+
+        Args:
+            reactor: Reactor claimed for reading
+            deadline: time.monotonic() value at which to give up
+
+        Returns:
+            The diagnostic payload, or None if the deadline passed
+        """
+        remaining = deadline - time.monotonic()
+        while remaining > 0:
+            if not self._wait_readable(remaining):
+                return None
+
+            # The select() above already used part of the budget; read_doip() gives
+            # up without reading anything when handed a zero timeout
+            remaining = max(deadline - time.monotonic(), _MIN_READ_TIME)
+            try:
+                with reactor.io_lock:
+                    message = self._read(timeout=remaining)
+            except TimeoutError:
+                return None
+
+            response = self._dispatch(reactor, message)
+            if response is not None:
+                return response
+            remaining = deadline - time.monotonic()
+        return None
+
+    def _dispatch(self, reactor: _Reactor, message) -> Optional[bytes]:
+        """
+        Route a DoIP message read from the socket.
+
+        Args:
+            reactor: Reactor holding the responses of the other connections
+            message: DoIP message returned by DoIPClient.read_doip()
+
+        Returns:
+            The diagnostic payload if the message is the target ECU's response, None
+            if it was handed over to another connection or ignored
+
+        Raises:
+            IOError: The target ECU's request was rejected with a negative acknowledge
+        """
+        message_type = type(message)
+        frame: Union[bytes, Exception]
+        if message_type is DiagnosticMessage:
+            frame = message.user_data
+        elif message_type is DiagnosticMessageNegativeAcknowledgement:
+            frame = IOError(
+                "Diagnostic request rejected with negative acknowledge code: "
+                f"{message.nack_code}"
+            )
+        else:
+            # Positive acknowledgements of our requests and of keep-alive messages
+            return None
+
+        if message.target_address != self._doip._client_logical_address:
+            self.logger.warning(
+                "Ignoring diagnostic message from %s to %s",
+                _hex_addr(message.source_address),
+                _hex_addr(message.target_address),
+            )
+            return None
+        if message.source_address != self._target_address:
+            reactor.stash(message.source_address, frame)
+            return None
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+
+    def _shared_reactor(self) -> _Reactor:
+        """Return the reactor, creating it for connections that own theirs."""
+        reactor = self._reactor
+        if reactor is None:
+            reactor = self._reactor = _Reactor()
+        return reactor
+
+    def _wait_readable(self, timeout: Optional[float]) -> bool:
+        """
+        Wait until the DoIP TCP socket has data to read.
+
+        DoIPClient polls its socket with short blocking reads until a message arrives.
+        Waiting on a selector first means a timeout costs a single select() call, and
+        read_doip() only runs once a message is known to be pending.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            False if the timeout expired without data, True otherwise
+        """
+        sock = getattr(self._doip, "_tcp_sock", None)
+        if not isinstance(sock, socket.socket):
+            return True
+
+        # With use_secure, records already decrypted by the SSL layer are not visible
+        # to select() either
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+
+        # Frames already buffered by the parser are not visible to select()
+        parser = getattr(self._doip, "_tcp_parser", None)
+        if parser is not None and parser.rx_buffer:
+            return True
+
+        return self._shared_reactor().wait_readable(sock, timeout)
+
     def empty_rxqueue(self):
         """
         Empty the reception buffer.
         """
-        # DoIPClient handles buffering internally
-        pass
+        # DoIPClient buffers unparsed bytes internally; only the responses another
+        # connection read on our behalf are kept here
+        if self._reactor is not None:
+            self._reactor.discard(self._target_address)
 
     def is_open(self) -> bool:
         """
         Check if connection is open.
         """
         return self._opened
+
+
+class AsyncUdsOnIpConnection:
+    """
+    asyncio-based DoIP connection for concurrent requests to multiple ECUs.
+
+    Unlike UdsOnIpConnection, which blocks for the full request/response round-trip,
+    this connection owns a TCP stream to the DoIP gateway and dispatches incoming
+    diagnostic messages by their source address. Requests to different ECUs behind
+    the same gateway can therefore be in flight at the same time, while requests to
+    the same ECU are serialized as required by UDS.
+
+    Args:
+        ecu_ip: IP address of the DoIP gateway/ECU
+        client_logical_address: Client logical address (default: 0x0E00)
+        activation_type: DoIP activation type (default: 0, None to skip activation)
+        protocol_version: DoIP protocol version (default: 0x03)
+        tcp_port: DoIP TCP port (default: 13400)
+
+    Example:
+        >>> async def main():
+        ...     conn = AsyncUdsOnIpConnection('192.168.1.10')
+        ...     await conn.open()
+        ...     try:
+        ...         engine, abs_ = await asyncio.gather(
+        ...             conn.read_data_by_identifier(0x00E0, 0xF190),
+        ...             conn.read_data_by_identifier(0x00E2, 0xF190),
+        ...         )
+        ...     finally:
+        ...         await conn.close()
+    """
+
+    __slots__ = (
+        "_ecu_ip",
+        "_client_logical_address",
+        "_activation_type",
+        "_protocol_version",
+        "_tcp_port",
+        "_parser",
+        "_reader",
+        "_writer",
+        "_rx_task",
+        "_activation",
+        "_queues",
+        "_locks",
+        "_error",
+        "logger",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        ecu_ip: str,
+        client_logical_address: int = 0x0E00,
+        activation_type: Optional[int] = 0,
+        protocol_version: int = 0x03,
+        tcp_port: int = 13400,
+    ):
+        self._ecu_ip = ecu_ip
+        self._client_logical_address = client_logical_address
+        self._activation_type = activation_type
+        self._protocol_version = protocol_version
+        self._tcp_port = tcp_port
+        self._parser = Parser()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._rx_task: Optional[asyncio.Future] = None
+        self._activation: Optional[asyncio.Future] = None
+        # Per-ECU receive queues and request locks, keyed by logical address
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        # Set when the receive loop dies; raised by every later request until close()
+        self._error: Optional[Exception] = None
+        self.logger = logging.getLogger("Connection[AsyncUdsOnIp]")
+
+    async def open(self, timeout: float = 2.0):
+        """
+        Open the TCP stream to the gateway and perform routing activation.
+
+        Args:
+            timeout: Maximum time to wait for connection and activation in seconds
+
+        Raises:
+            ConnectionRefusedError: If routing activation is denied
+        """
+        if self._writer is not None:
+            return
+
+        self._reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._ecu_ip, self._tcp_port), timeout
+        )
+        self._writer = writer
+        self._rx_task = asyncio.ensure_future(self._receive_loop())
+
+        if self._activation_type is not None:
+            self._activation = asyncio.get_event_loop().create_future()
+            self._write(
+                RoutingActivationRequest(self._client_logical_address, self._activation_type)
+            )
+            try:
+                await writer.drain()
+                result = await asyncio.wait_for(self._activation, timeout)
+            except BaseException:
+                await self.close()
+                raise
+            if result.response_code != RoutingActivationResponse.ResponseCode.Success:
+                await self.close()
+                raise ConnectionRefusedError(
+                    f"Activation Request failed with code {result.response_code}"
+                )
+
+        self.logger.info("AsyncUdsOnIpConnection opened")
+
+    async def close(self):
+        """
+        Close the TCP stream to the gateway.
+        """
+        if self._writer is None:
+            return
+
+        self._rx_task.cancel()
+        try:
+            await self._rx_task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+        self._reader = self._writer = self._rx_task = self._activation = None
+        self._error = None
+        self._parser.reset()
+        self._queues.clear()
+        self._locks.clear()
+        self.logger.info("AsyncUdsOnIpConnection closed")
+
+    def is_open(self) -> bool:
+        """
+        Check if connection is open.
+
+        A connection whose stream to the gateway failed is no longer open, even
+        before close() is called.
+        """
+        return self._writer is not None and self._error is None
+
+    async def send(self, target_address: int, payload: bytes):
+        """
+        Send a UDS payload to the given target address.
+
+        Args:
+            target_address: Logical address of the target ECU
+            payload: UDS message payload to send
+
+        Raises:
+            Exception: The error that ended the stream to the gateway, if any
+        """
+        if self._error is not None:
+            raise self._error
+        self.logger.debug(
+            "Sending %d bytes to %#x: %s", len(payload), target_address, _Lazy(payload.hex)
+        )
+        # DiagnosticMessage only concatenates the payload after its header, no copy needed
+        writer = self._write(
+            DiagnosticMessage(self._client_logical_address, target_address, payload)
+        )
+        await writer.drain()
+
+    async def wait_frame(self, source_address: int, timeout: Optional[float] = None) -> bytes:
+        """
+        Wait for the next UDS response frame from the given ECU.
+
+        Args:
+            source_address: Logical address of the responding ECU
+            timeout: Maximum time to wait for response in seconds
+
+        Returns:
+            Received frame data
+
+        Raises:
+            TimeoutError: If no frame is received in time
+        """
+        try:
+            frame: Union[bytes, Exception] = await asyncio.wait_for(
+                self._queue(source_address).get(), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Timed out waiting for diagnostic response from {_hex_addr(source_address)}"
+            ) from None
+        if isinstance(frame, Exception):
+            raise frame
+        self.logger.debug("Received %d bytes: %s", len(frame), _Lazy(frame.hex))
+        return frame
+
+    async def request(self, target_address: int, payload: bytes, timeout: float = 2.0) -> bytes:
+        """
+        Send a UDS request and wait for its final response.
+
+        Requests to the same target address are serialized, and "response pending"
+        negative responses (NRC 0x78) are skipped.
+
+        Args:
+            target_address: Logical address of the target ECU
+            payload: UDS request payload
+            timeout: Maximum time to wait for each response frame in seconds
+
+        Returns:
+            Raw UDS response payload
+        """
+        lock = self._locks.get(target_address)
+        if lock is None:
+            lock = self._locks[target_address] = asyncio.Lock()
+
+        async with lock:
+            queue = self._queue(target_address)
+            while not queue.empty():
+                queue.get_nowait()
+
+            await self.send(target_address, payload)
+            while True:
+                frame = await self.wait_frame(target_address, timeout)
+                if (
+                    len(frame) >= 3
+                    and frame[0] == 0x7F
+                    and frame[2] == Response.Code.RequestCorrectlyReceived_ResponsePending
+                ):
+                    continue
+                return frame
+
+    async def read_data_by_identifier(
+        self, target_address: int, did: int, timeout: float = 2.0
+    ) -> Response:
+        """
+        Read data by identifier (service 0x22) from the given ECU.
+
+        Args:
+            target_address: Logical address of the target ECU
+            did: Data identifier
+            timeout: Maximum time to wait for response in seconds
+
+        Returns:
+            Service response with .data attribute
+        """
+        request = services.ReadDataByIdentifier.make_request(didlist=did, didconfig=None)
+        return await self._send_request(target_address, request, timeout)
+
+    async def tester_present(
+        self, target_address: int, suppress_response: bool = False, timeout: float = 2.0
+    ) -> Optional[Response]:
+        """
+        Send TesterPresent service request to the given ECU.
+
+        Args:
+            target_address: Logical address of the target ECU
+            suppress_response: If True, suppress positive response
+            timeout: Maximum time to wait for response in seconds
+
+        Returns:
+            Service response, or None if the response is suppressed
+        """
+        request = services.TesterPresent.make_request()
+        if suppress_response:
+            await self.send(target_address, request.get_payload(suppress_positive_response=True))
+            return None
+        return await self._send_request(target_address, request, timeout)
+
+    async def _send_request(
+        self, target_address: int, request: Request, timeout: float
+    ) -> Response:
+        response = Response.from_payload(
+            await self.request(target_address, request.get_payload(), timeout)
+        )
+        if not response.valid:
+            raise InvalidResponseException(response)
+        if not response.positive:
+            raise NegativeResponseException(response)
+        return response
+
+    def _queue(self, address: int) -> asyncio.Queue:
+        if self._error is not None:
+            raise self._error
+        queue = self._queues.get(address)
+        if queue is None:
+            queue = self._queues[address] = asyncio.Queue()
+        return queue
+
+    def _write(self, message) -> asyncio.StreamWriter:
+        if self._writer is None:
+            raise ConnectionError("AsyncUdsOnIpConnection is not open")
+        self._writer.write(
+            DoIPClient._pack_doip(
+                self._protocol_version, payload_message_to_type[type(message)], message.pack()
+            )
+        )
+        return self._writer
+
+    async def _receive_loop(self):
+        try:
+            while True:
+                data = await self._reader.read(4096)
+                if not data:
+                    raise ConnectionResetError("DoIP gateway closed the connection")
+                message = self._parser.read_message(data)
+                while message is not None:
+                    self._dispatch(message)
+                    message = self._parser.read_message(b"")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error("Error receiving frame: %s", e)
+            self._error = e
+            if self._activation is not None and not self._activation.done():
+                self._activation.set_exception(e)
+            for queue in self._queues.values():
+                queue.put_nowait(e)
+
+    def _dispatch(self, message):
+        if isinstance(message, DiagnosticMessage):
+            if message.target_address == self._client_logical_address:
+                self._queue(message.source_address).put_nowait(bytes(message.user_data))
+        elif isinstance(message, DiagnosticMessageNegativeAcknowledgement):
+            self._queue(message.source_address).put_nowait(
+                IOError(
+                    "Diagnostic request rejected with negative acknowledge code: "
+                    f"{message.nack_code}"
+                )
+            )
+        elif isinstance(message, RoutingActivationResponse):
+            if self._activation is not None and not self._activation.done():
+                self._activation.set_result(message)
+        elif isinstance(message, AliveCheckRequest):
+            self._write(AliveCheckResponse(self._client_logical_address))
+        elif isinstance(message, GenericDoIPNegativeAcknowledge):
+            error = IOError(f"DoIP Negative Acknowledge. NACK Code: {message.nack_code}")
+            for queue in self._queues.values():
+                queue.put_nowait(error)
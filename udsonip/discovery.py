@@ -2,17 +2,72 @@
 ECU discovery utilities for DoIP networks.
 """
 
-from typing import List, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+import asyncio
+import functools
+import ipaddress
+import queue
+import selectors
+import socket
+import struct
+import threading
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from doipclient import DoIPClient
+from doipclient.messages import VehicleIdentificationRequest, VehicleIdentificationResponse
 from . import exceptions
 from .client import UdsOnIpClient
 
+# DoIP UDP discovery port and the destination of vehicle identification broadcasts
+_UDP_DISCOVERY_PORT = 13400
+_VEHICLE_ID_BROADCAST = ("255.255.255.255", _UDP_DISCOVERY_PORT)
 
-@dataclass
-class ECUInfo:
+# Generic DoIP header (version, inverse version, payload type, payload length) and the
+# vehicle announcement payload up to the further action code (ISO 13400-2 Table 5)
+_DOIP_HEADER = struct.Struct("!BBHL")
+_VEHICLE_ID_RESPONSE = struct.Struct("!17sH6s6sB")
+
+# IPv4 address as a 32-bit integer, for enumerating subnets without IPv4Address objects
+_IPV4_ADDRESS = struct.Struct("!I")
+
+# Socket option restricting a socket to one network interface (Linux only)
+_SO_BINDTODEVICE = getattr(socket, "SO_BINDTODEVICE", None)
+
+# Interface flags (linux/if.h) as exposed in /sys/class/net/<name>/flags
+_IFF_UP = 0x1
+_IFF_LOOPBACK = 0x8
+
+# Largest network probed host by host (an IPv4 /8 or an IPv6 /104)
+_MAX_SCAN_ADDRESSES = 1 << 24
+
+
+@functools.lru_cache(maxsize=1024)
+def _ecu_str(ip: str, logical_address: int) -> str:
+    """Format (and memoize) the str() of an ECUInfo."""
+    return f"ECU({ip} @ 0x{logical_address:04X})"
+
+
+@functools.lru_cache(maxsize=1024)
+def _ecu_repr(ip: str, logical_address: int) -> str:
+    """Format (and memoize) the repr() of an ECUInfo."""
+    return f"ECUInfo(ip='{ip}', logical_address=0x{logical_address:04X})"
+
+
+class ECUInfo(NamedTuple):
     """Information about a discovered ECU."""
 
     ip: str
@@ -31,10 +86,10 @@ class ECUInfo:
     """Further action required byte"""
 
     def __str__(self):
-        return f"ECU({self.ip} @ 0x{self.logical_address:04X})"
+        return _ecu_str(self.ip, self.logical_address)
 
     def __repr__(self):
-        return f"ECUInfo(ip='{self.ip}', logical_address=0x{self.logical_address:04X})"
+        return _ecu_repr(self.ip, self.logical_address)
 
     def connect(self, client_ip: Optional[str] = None, **kwargs):
         """
@@ -56,8 +111,86 @@ class ECUInfo:
         )
 
 
+class _DiscoveryCache:
+    """Thread-safe LRU cache of discovery results with optional time-to-live."""
+
+    def __init__(self, maxsize: int = 128):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, ttl: Optional[float] = None) -> Any:
+        """Return the cached value for key, or None if missing or older than ttl."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if ttl is not None and time.monotonic() - stored_at >= ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store value for key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+_entity_cache = _DiscoveryCache(maxsize=128)
+_discovery_cache = _DiscoveryCache(maxsize=16)
+
+
+def _normalize_ip(ip: str) -> str:
+    """Return the canonical form of an IP address string (hostnames are kept as-is)."""
+    ip = ip.strip()
+    try:
+        return str(ipaddress.ip_address(ip))
+    except ValueError:
+        return ip
+
+
+def _ecu_info_from_announcement(ip: str, announcement) -> ECUInfo:
+    """Build an ECUInfo from a vehicle announcement/identification response."""
+    return ECUInfo(
+        ip=ip,
+        logical_address=announcement.logical_address,
+        eid=announcement.eid,
+        gid=announcement.gid,
+        # The further_action_required property only knows the ISO codes and raises
+        # ValueError for the VM-specific ones (0x11-0xFF); keep the raw byte
+        further_action_required=int(announcement._further_action_required),
+    )
+
+
+def invalidate_discovery_cache():
+    """
+    Clear all cached discover_ecus() and get_entity() results.
+
+    Example:
+        >>> invalidate_discovery_cache()
+        >>> ecus = discover_ecus()  # performs a fresh discovery
+    """
+    _entity_cache.clear()
+    _discovery_cache.clear()
+
+
 def discover_ecus(
-    interface: Optional[str] = None, timeout: float = 5.0, protocol_version: int = 0x03
+    interface: Optional[Union[str, Sequence[str]]] = None,
+    timeout: float = 5.0,
+    protocol_version: int = 0x03,
+    use_cache: bool = True,
+    ttl: float = 30.0,
+    listeners: int = 1,
 ) -> List[ECUInfo]:
     """
     Discover ECUs on the DoIP network using hybrid discovery.
@@ -70,15 +203,31 @@ def discover_ecus(
     spontaneous announcements (e.g., newly connected devices).
 
     Args:
-        interface: Network interface to use (None for default)
+        interface: Network interface to use. With a list of interface names the
+                   request is broadcast on each of them and all their listeners
+                   share one timeout window. None broadcasts on every interface
+                   that is up, except loopback, where sockets can be bound to an
+                   interface (Linux); elsewhere, or with several listeners, only
+                   on the interface of the default route (default: None)
         timeout: Discovery timeout in seconds (time to listen for announcements)
         protocol_version: DoIP protocol version (default: 0x03)
+        use_cache: Return the last non-empty result for the same interface and
+                   protocol version if it is younger than ttl and was collected
+                   over a timeout at least as long (default: True)
+        ttl: Maximum age of a cached result in seconds (default: 30.0)
+        listeners: Number of SO_REUSEPORT sockets drained by parallel threads. Helps
+                   on busy networks where responses arrive faster than a single
+                   receive loop can handle. Ignored where SO_REUSEPORT is not
+                   available (default: 1)
 
     Returns:
         List of discovered ECU information (duplicates filtered by IP and logical address)
 
     Raises:
-        DiscoveryError: If discovery fails due to network or protocol errors
+        DiscoveryError: If discovery fails due to network or protocol errors before
+                        any ECU was found. Later errors end the listening early
+                        with a RuntimeWarning and the ECUs found so far are
+                        returned.
 
     Example:
         >>> ecus = discover_ecus(timeout=5.0)
@@ -88,16 +237,472 @@ def discover_ecus(
         >>> # Connect to first discovered ECU
         >>> if ecus:
         ...     client = ecus[0].connect()
+        >>>
+        >>> # Search two vehicle networks at once
+        >>> ecus = discover_ecus(interface=['eth0', 'eth1'])
+    """
+    if interface is not None and not isinstance(interface, str):
+        interface = tuple(interface)
+    cache_key = (interface, protocol_version)
+    if use_cache:
+        cached = _discovery_cache.get(cache_key, ttl)
+        # A shorter listening window may have missed ECUs that answer late
+        if cached is not None and cached[0] >= timeout:
+            return list(cached[1])
+
+    # Keyed by (ip, logical_address) to filter duplicates; preserves discovery order
+    discovered_ecus: Dict[Tuple[str, int], ECUInfo] = {}
+    try:
+        # A limited broadcast only leaves through the default route's interface
+        interfaces = _broadcast_interfaces() if interface is None and listeners <= 1 else ()
+        if isinstance(interface, tuple):
+            announcements = _select_announcements(interface, timeout, protocol_version)
+        elif len(interfaces) > 1:
+            announcements = _select_announcements(interfaces, timeout, protocol_version)
+        elif listeners > 1 and hasattr(socket, "SO_REUSEPORT"):
+            announcements = _drain_announcements(interface, timeout, protocol_version, listeners)
+        else:
+            announcements = _await_announcements(interface, timeout, protocol_version)
+
+        for ip, announcement in announcements:
+            key = (ip, announcement.logical_address)
+
+            # Avoid duplicate ECUs (same IP and logical address)
+            if key not in discovered_ecus:
+                discovered_ecus[key] = _ecu_info_from_announcement(ip, announcement)
+
+    except Exception as e:
+        if not discovered_ecus:
+            if isinstance(e, exceptions.DiscoveryError):
+                raise
+            raise exceptions.DiscoveryError(f"ECU discovery failed: {e}")
+        # Keep what was found so far rather than discarding it; partial results
+        # are not cached
+        warnings.warn(
+            f"ECU discovery stopped early, returning partial results: {e}", RuntimeWarning
+        )
+        return list(discovered_ecus.values())
+
+    if discovered_ecus:
+        _discovery_cache.put(cache_key, (timeout, tuple(discovered_ecus.values())))
+
+    return list(discovered_ecus.values())
+
+
+def _await_announcements(
+    interface: Optional[str], timeout: float, protocol_version: int
+) -> Iterator[Tuple[str, Any]]:
+    """Broadcast a vehicle identification request and yield (ip, announcement) pairs."""
+    # Step 1: Broadcast Vehicle Identification Request
+    # This triggers all online ECUs to respond with Vehicle Announcement messages
+    try:
+        DoIPClient.request_vehicle_identification(
+            interface=interface, protocol_version=protocol_version
+        )
+    except Exception as e:
+        # If broadcast fails, we can still listen for spontaneous announcements
+        warnings.warn(f"Failed to broadcast vehicle identification request: {e}", RuntimeWarning)
+
+    # Step 2: Listen for Vehicle Announcement messages for the full timeout period.
+    # The deadline is monotonic so wall-clock adjustments cannot cut the window
+    # short or extend it, and every wait covers the whole remaining window.
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            address, announcement = DoIPClient.await_vehicle_announcement(
+                timeout=remaining, interface=interface
+            )
+        except TimeoutError:
+            # Nothing arrived before the deadline
+            break
+        yield address[0], announcement
+
+
+def _announcement_reader(sock: socket.socket, deadline: float, results: queue.Queue):
+    """Queue every vehicle announcement received on sock until the deadline."""
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            sock.settimeout(remaining)
+            data, addr = sock.recvfrom(4096)
+        except socket.timeout:
+            return
+        except OSError:
+            # Socket closed by the consumer
+            return
+        message = _parse_vehicle_identification_response(data)
+        if message is not None:
+            results.put((addr[0], message))
+
+
+def _drain_announcements(
+    interface: Optional[str], timeout: float, protocol_version: int, listeners: int
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Broadcast a vehicle identification request and drain the responses in parallel.
+
+    Every listener binds the discovery port with SO_REUSEPORT, so the kernel spreads
+    unicast responses across the sockets. Broadcast announcements reach every
+    socket and are removed by the caller's duplicate filter.
+    """
+    sockets: List[socket.socket] = []
+    try:
+        for _ in range(listeners):
+            sockets.append(_create_discovery_socket(interface, reuse_port=True))
+
+        try:
+            sockets[0].sendto(
+                _vehicle_identification_request(protocol_version), _VEHICLE_ID_BROADCAST
+            )
+        except OSError as e:
+            warnings.warn(
+                f"Failed to broadcast vehicle identification request: {e}", RuntimeWarning
+            )
+
+        results: queue.Queue = queue.Queue()
+        deadline = time.monotonic() + timeout
+        readers = [
+            threading.Thread(
+                target=_announcement_reader, args=(sock, deadline, results), daemon=True
+            )
+            for sock in sockets
+        ]
+        for reader in readers:
+            reader.start()
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                yield results.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        for reader in readers:
+            reader.join()
+        while not results.empty():
+            yield results.get_nowait()
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+def _select_announcements(
+    interfaces: Sequence[str], timeout: float, protocol_version: int
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Broadcast a vehicle identification request on every interface and yield the
+    (ip, announcement) pairs received on any of them.
+
+    One listener per interface is registered with a single selector, so the
+    timeout is shared by all interfaces instead of being spent on each in turn.
+    """
+    request = _vehicle_identification_request(protocol_version)
+    selector = selectors.DefaultSelector()
+    sockets: List[socket.socket] = []
+    try:
+        for name in interfaces:
+            sock = _create_discovery_socket(name)
+            sockets.append(sock)
+            selector.register(sock, selectors.EVENT_READ)
+            try:
+                sock.sendto(request, _VEHICLE_ID_BROADCAST)
+            except OSError as e:
+                warnings.warn(
+                    f"Failed to broadcast vehicle identification request on {name}: {e}",
+                    RuntimeWarning,
+                )
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                sock = cast(socket.socket, key.fileobj)
+                # Drain everything already queued before selecting again
+                while True:
+                    try:
+                        data, addr = sock.recvfrom(4096)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    message = _parse_vehicle_identification_response(data)
+                    if message is not None:
+                        yield addr[0], message
+    finally:
+        selector.close()
+        for sock in sockets:
+            sock.close()
+
+
+class _AnnouncementProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol queueing every received vehicle announcement."""
+
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+
+    def datagram_received(self, data, addr):
+        message = _parse_vehicle_identification_response(data)
+        if message is not None:
+            self._queue.put_nowait((addr, message))
+
+    def pause_writing(self):
+        # The transport's send buffer is above its high-water mark
+        self._can_write.clear()
+
+    def resume_writing(self):
+        self._can_write.set()
+
+    async def drain(self):
+        """Wait until the transport accepts more datagrams."""
+        await self._can_write.wait()
+
+
+class _EntityProbe(asyncio.DatagramProtocol):
+    """
+    Datagram protocol matching vehicle identification responses to pending
+    requests by source IP, so a single UDP endpoint can query many entities.
+    """
+
+    def __init__(self):
+        self._transport = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data, addr):
+        # Ignore announcements broadcast by other entities meanwhile
+        future = self._pending.get(addr[0])
+        if future is None or future.done():
+            return
+        message = _parse_vehicle_identification_response(data)
+        if message is not None:
+            future.set_result(message)
+
+    async def request(self, ip: str, timeout: float, protocol_version: int):
+        """Query ip and return its response, or None if it does not answer in time."""
+        future = asyncio.get_event_loop().create_future()
+        self._pending[ip] = future
+        try:
+            self._transport.sendto(
+                _vehicle_identification_request(protocol_version), (ip, _UDP_DISCOVERY_PORT)
+            )
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if self._pending.get(ip) is future:
+                del self._pending[ip]
+
+
+async def _open_entity_probe(ipv6: bool = False) -> Tuple[asyncio.DatagramTransport, _EntityProbe]:
+    """Open a UDP endpoint on an ephemeral port for querying DoIP entities."""
+    loop = asyncio.get_event_loop()
+    local_addr = ("::", 0) if ipv6 else ("0.0.0.0", 0)
+    return await loop.create_datagram_endpoint(_EntityProbe, local_addr=local_addr)
+
+
+async def _query_entity(
+    probe: _EntityProbe,
+    ip: str,
+    timeout: float,
+    protocol_version: int,
+    use_cache: bool = True,
+    ttl: float = 30.0,
+) -> Optional[ECUInfo]:
+    """Query a single entity through probe, going through get_entity()'s cache."""
+    cache_key = (ip, protocol_version)
+    if use_cache:
+        cached: Optional[ECUInfo] = _entity_cache.get(cache_key, ttl)
+        if cached is not None:
+            return cached
+
+    announcement = await probe.request(ip, timeout, protocol_version)
+    if announcement is None:
+        return None
+    ecu_info = _ecu_info_from_announcement(ip, announcement)
+    _entity_cache.put(cache_key, ecu_info)
+    return ecu_info
+
+
+def _interface_flags(name: str) -> Optional[int]:
+    """Return the IFF_* flags of a network interface, or None if they cannot be read."""
+    try:
+        with open(f"/sys/class/net/{name}/flags") as f:
+            return int(f.read(), 16)
+    except (OSError, ValueError):
+        return None
+
+
+def _broadcast_interfaces() -> Tuple[str, ...]:
+    """
+    List the interfaces a vehicle identification request can be broadcast on.
+
+    Returns the names of all interfaces that are up, except loopback, or an empty
+    tuple where sockets cannot be bound to an interface (no SO_BINDTODEVICE, or
+    missing privileges on kernels before Linux 5.7).
+    """
+    if _SO_BINDTODEVICE is None or not hasattr(socket, "if_nameindex"):
+        return ()
+    try:
+        names = [name for _, name in socket.if_nameindex()]
+    except OSError:
+        return ()
+
+    interfaces = []
+    for name in names:
+        flags = _interface_flags(name)
+        if flags is None:
+            if name != "lo":
+                interfaces.append(name)
+        elif flags & _IFF_UP and not flags & _IFF_LOOPBACK:
+            interfaces.append(name)
+    if not interfaces:
+        return ()
+
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.setsockopt(socket.SOL_SOCKET, _SO_BINDTODEVICE, interfaces[0].encode())
+    except OSError:
+        return ()
+    finally:
+        probe.close()
+    return tuple(interfaces)
+
+
+def _create_discovery_socket(
+    interface: Optional[str] = None, reuse_port: bool = False
+) -> socket.socket:
+    """
+    Create a non-blocking UDP socket bound to the DoIP discovery port.
+
+    Raises:
+        DiscoveryError: If an interface is given but sockets cannot be bound to one
+                        on this platform (no SO_BINDTODEVICE)
+    """
+    if interface is not None and _SO_BINDTODEVICE is None:
+        # Listening on every interface instead would hand the same announcements to
+        # each per-interface socket
+        raise exceptions.DiscoveryError(
+            f"Cannot listen on interface {interface!r}: binding a socket to an "
+            "interface (SO_BINDTODEVICE) is not supported on this platform"
+        )
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if interface is not None and _SO_BINDTODEVICE is not None:
+            sock.setsockopt(socket.SOL_SOCKET, _SO_BINDTODEVICE, interface.encode())
+        sock.bind(("", _UDP_DISCOVERY_PORT))
+        sock.setblocking(False)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+@functools.lru_cache(maxsize=None)
+def _vehicle_identification_request(protocol_version: int) -> bytes:
+    """Pack a DoIP Vehicle Identification Request (header only, empty payload)."""
+    return _DOIP_HEADER.pack(
+        protocol_version, 0xFF ^ protocol_version, VehicleIdentificationRequest.payload_type, 0
+    )
+
+
+def _parse_vehicle_identification_response(data: bytes) -> Optional[VehicleIdentificationResponse]:
+    """
+    Decode a vehicle announcement/identification response datagram.
+
+    Only one DoIP message is sent per datagram, so the header and payload are
+    unpacked in place instead of being fed through doipclient's byte-wise Parser.
+
+    Returns:
+        The decoded response, or None for any other or malformed datagram
+    """
+    if len(data) < _DOIP_HEADER.size + _VEHICLE_ID_RESPONSE.size:
+        return None
+    version, inverse_version, payload_type, length = _DOIP_HEADER.unpack_from(data)
+    if (
+        version ^ inverse_version != 0xFF
+        or payload_type != VehicleIdentificationResponse.payload_type
+        or length < _VEHICLE_ID_RESPONSE.size
+        or len(data) < _DOIP_HEADER.size + length
+    ):
+        return None
+
+    vin, logical_address, eid, gid, further_action = _VEHICLE_ID_RESPONSE.unpack_from(
+        data, _DOIP_HEADER.size
+    )
+    # The VIN/GID sync status byte is optional
+    end = _DOIP_HEADER.size + _VEHICLE_ID_RESPONSE.size
+    sync_status = data[end] if length > _VEHICLE_ID_RESPONSE.size else None
+    return VehicleIdentificationResponse(
+        vin, logical_address, eid, gid, further_action, sync_status
+    )
+
+
+async def discover_ecus_async(
+    interface: Optional[str] = None,
+    timeout: float = 5.0,
+    protocol_version: int = 0x03,
+    use_cache: bool = True,
+    ttl: float = 30.0,
+) -> List[ECUInfo]:
     """
+    Discover ECUs on the DoIP network without blocking the event loop.
+
+    asyncio counterpart of discover_ecus(). A single UDP endpoint is opened before
+    the Vehicle Identification Request is broadcast, so responses arriving while
+    the request is still being sent are not lost, and announcements are received
+    for the whole timeout without polling.
+
+    Args:
+        interface: Network interface to use (None for default)
+        timeout: Discovery timeout in seconds (time to listen for announcements)
+        protocol_version: DoIP protocol version (default: 0x03)
+        use_cache: Return the last non-empty result for the same interface and
+                   protocol version if it is younger than ttl and was collected
+                   over a timeout at least as long (default: True)
+        ttl: Maximum age of a cached result in seconds (default: 30.0)
+
+    Returns:
+        List of discovered ECU information (duplicates filtered by IP and logical address)
+
+    Raises:
+        DiscoveryError: If discovery fails due to network or protocol errors
+
+    Example:
+        >>> ecus = asyncio.run(discover_ecus_async(timeout=5.0))
+    """
+    cache_key = (interface, protocol_version)
+    if use_cache:
+        cached = _discovery_cache.get(cache_key, ttl)
+        # A shorter listening window may have missed ECUs that answer late
+        if cached is not None and cached[0] >= timeout:
+            return list(cached[1])
+
+    loop = asyncio.get_event_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    transport = None
     try:
-        discovered_ecus = []
-        seen_ecus = set()  # To store (ip, logical_address) to avoid duplicates
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _AnnouncementProtocol(queue), sock=_create_discovery_socket(interface)
+        )
 
-        # Step 1: Broadcast Vehicle Identification Request
-        # This triggers all online ECUs to respond with Vehicle Announcement messages
         try:
-            DoIPClient.request_vehicle_identification(
-                interface=interface, protocol_version=protocol_version
+            transport.sendto(
+                _vehicle_identification_request(protocol_version), _VEHICLE_ID_BROADCAST
             )
         except Exception as e:
             # If broadcast fails, we can still listen for spontaneous announcements
@@ -105,56 +710,56 @@ def discover_ecus(
                 f"Failed to broadcast vehicle identification request: {e}", RuntimeWarning
             )
 
-        # Step 2: Listen for Vehicle Announcement messages for the full timeout period
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        discovered_ecus: Dict[Tuple[str, int], ECUInfo] = {}
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
             try:
-                remaining_timeout = timeout - (time.time() - start_time)
-                if remaining_timeout <= 0:
-                    break
-
-                # Listen for announcements with a short internal timeout
-                # This allows the loop to check remaining_timeout frequently
-                address, announcement = DoIPClient.await_vehicle_announcement(
-                    timeout=min(remaining_timeout, 1.0), interface=interface
-                )
+                address, announcement = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
 
-                ip, _ = address
-                logical_address = announcement.logical_address
-
-                # Avoid duplicate ECUs (same IP and logical address)
-                if (ip, logical_address) not in seen_ecus:
-                    ecu_info = ECUInfo(
-                        ip=ip,
-                        logical_address=logical_address,
-                        eid=announcement.eid,
-                        gid=announcement.gid,
-                        further_action_required=announcement.further_action_required.value,
-                    )
-                    discovered_ecus.append(ecu_info)
-                    seen_ecus.add((ip, logical_address))
-
-            except TimeoutError:
-                # No announcement received within the internal timeout window
-                # Continue listening until the full timeout period expires
-                continue
+            ip = address[0]
+            key = (ip, announcement.logical_address)
+            if key not in discovered_ecus:
+                discovered_ecus[key] = _ecu_info_from_announcement(ip, announcement)
+
+        if discovered_ecus:
+            _discovery_cache.put(cache_key, (timeout, tuple(discovered_ecus.values())))
 
-        return discovered_ecus
+        return list(discovered_ecus.values())
 
     except exceptions.DiscoveryError:
         raise
     except Exception as e:
         raise exceptions.DiscoveryError(f"ECU discovery failed: {e}")
+    finally:
+        if transport is not None:
+            transport.close()
 
 
-def get_entity(ip: str, timeout: float = 2.0, protocol_version: int = 0x03) -> Optional[ECUInfo]:
+def get_entity(
+    ip: str,
+    timeout: float = 2.0,
+    protocol_version: int = 0x03,
+    use_cache: bool = True,
+    ttl: float = 30.0,
+) -> Optional[ECUInfo]:
     """
     Get entity information from a specific DoIP gateway/ECU.
 
+    Successful results are kept for ttl seconds in an LRU cache keyed by IP address
+    and protocol version; call invalidate_discovery_cache() to drop them.
+
     Args:
         ip: IP address of the DoIP entity
         timeout: Request timeout in seconds
         protocol_version: DoIP protocol version (default: 0x03)
+        use_cache: Return a previously fetched result for the same entity if it is
+                   younger than ttl (default: True)
+        ttl: Maximum age of a cached result in seconds (default: 30.0)
 
     Returns:
         ECUInfo if successful, None otherwise
@@ -164,6 +769,13 @@ def get_entity(ip: str, timeout: float = 2.0, protocol_version: int = 0x03) -> O
         >>> if ecu:
         ...     print(f"ECU at {ecu.ip}: {ecu.logical_address:#x}")
     """
+    ip = _normalize_ip(ip)
+    cache_key = (ip, protocol_version)
+    if use_cache:
+        cached: Optional[ECUInfo] = _entity_cache.get(cache_key, ttl)
+        if cached is not None:
+            return cached
+
     try:
         address, announcement = DoIPClient.get_entity(
             ip=ip, timeout=timeout, protocol_version=protocol_version
@@ -171,14 +783,331 @@ def get_entity(ip: str, timeout: float = 2.0, protocol_version: int = 0x03) -> O
 
         ip_address, _ = address
 
-        return ECUInfo(
-            ip=ip_address,
-            logical_address=announcement.logical_address,
-            eid=announcement.eid,
-            gid=announcement.gid,
-            further_action_required=announcement.further_action_required.value,
-        )
+        ecu_info = _ecu_info_from_announcement(ip_address, announcement)
+        _entity_cache.put(cache_key, ecu_info)
+        return ecu_info
     except TimeoutError:
         return None
     except Exception as e:
         raise exceptions.DiscoveryError(f"Failed to get entity info from {ip}: {e}")
+
+
+async def get_entity_async(
+    ip: str,
+    timeout: float = 2.0,
+    protocol_version: int = 0x03,
+    use_cache: bool = True,
+    ttl: float = 30.0,
+) -> Optional[ECUInfo]:
+    """
+    Get entity information from a specific DoIP gateway/ECU without blocking.
+
+    asyncio counterpart of get_entity(). The Vehicle Identification Request is
+    sent over UDP from an ephemeral port and the first response from ip is used.
+    Results share get_entity()'s cache.
+
+    Args:
+        ip: IP address of the DoIP entity
+        timeout: Request timeout in seconds
+        protocol_version: DoIP protocol version (default: 0x03)
+        use_cache: Return a previously fetched result for the same entity if it is
+                   younger than ttl (default: True)
+        ttl: Maximum age of a cached result in seconds (default: 30.0)
+
+    Returns:
+        ECUInfo if successful, None otherwise
+
+    Raises:
+        DiscoveryError: If the request cannot be sent
+
+    Example:
+        >>> ecu = asyncio.run(get_entity_async('192.168.1.10'))
+    """
+    ip = _normalize_ip(ip)
+    if use_cache:
+        cached: Optional[ECUInfo] = _entity_cache.get((ip, protocol_version), ttl)
+        if cached is not None:
+            return cached
+
+    transport = None
+    try:
+        transport, probe = await _open_entity_probe(ipv6=":" in ip)
+        return await _query_entity(probe, ip, timeout, protocol_version, use_cache=False)
+    except Exception as e:
+        raise exceptions.DiscoveryError(f"Failed to get entity info from {ip}: {e}")
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+def _iter_hosts(network_obj) -> Iterator[str]:
+    """
+    Yield the host addresses of a network as strings, in address order.
+
+    IPv4 subnets are enumerated as integers and packed straight into dotted-quad
+    strings, so no IPv4Address object is created per host.
+    """
+    if network_obj.version != 4:
+        return (str(ip) for ip in network_obj.hosts())
+
+    first = int(network_obj.network_address)
+    last = int(network_obj.broadcast_address)
+    # /31 and /32 have no network or broadcast address to skip (RFC 3021)
+    if network_obj.prefixlen < 31:
+        first += 1
+        last -= 1
+    pack = _IPV4_ADDRESS.pack
+    ntoa = socket.inet_ntoa
+    return (ntoa(pack(ip)) for ip in range(first, last + 1))
+
+
+async def _collect_responses(
+    queue: asyncio.Queue, network_obj, timeout: float, protocol_version: int
+) -> List[ECUInfo]:
+    """
+    Gather the vehicle identification responses queued by an _AnnouncementProtocol
+    from hosts of network_obj for the whole timeout, in address order.
+    """
+    loop = asyncio.get_event_loop()
+    discovered_ecus: Dict[Tuple[str, int], ECUInfo] = {}
+    deadline = loop.time() + timeout
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            address, announcement = await asyncio.wait_for(queue.get(), remaining)
+        except asyncio.TimeoutError:
+            break
+        ip = address[0]
+        key = (ip, announcement.logical_address)
+        if key in discovered_ecus or ipaddress.ip_address(ip) not in network_obj:
+            continue
+        ecu_info = discovered_ecus[key] = _ecu_info_from_announcement(ip, announcement)
+        _entity_cache.put((ip, protocol_version), ecu_info)
+
+    return sorted(discovered_ecus.values(), key=lambda ecu: ipaddress.ip_address(ecu.ip))
+
+
+async def _broadcast_sweep(network_obj, timeout: float, protocol_version: int) -> List[ECUInfo]:
+    """
+    Send one Vehicle Identification Request to the subnet's broadcast address and
+    collect the responses of its hosts for the whole timeout.
+    """
+    if network_obj.version != 4:
+        raise exceptions.DiscoveryError(f"Broadcast scan requires an IPv4 network: {network_obj}")
+
+    loop = asyncio.get_event_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    transport = None
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _AnnouncementProtocol(queue), local_addr=("0.0.0.0", 0), allow_broadcast=True
+        )
+        transport.sendto(
+            _vehicle_identification_request(protocol_version),
+            (str(network_obj.broadcast_address), _UDP_DISCOVERY_PORT),
+        )
+        return await _collect_responses(queue, network_obj, timeout, protocol_version)
+    except Exception as e:
+        raise exceptions.DiscoveryError(f"Broadcast scan of {network_obj} failed: {e}")
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+async def _fan_out_sweep(network_obj, timeout: float, protocol_version: int) -> List[ECUInfo]:
+    """
+    Send a Vehicle Identification Request to every host from one UDP socket, then
+    collect the responses for a single timeout window.
+    """
+    loop = asyncio.get_event_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    transport = None
+    try:
+        local_addr = ("::", 0) if network_obj.version == 6 else ("0.0.0.0", 0)
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: _AnnouncementProtocol(queue), local_addr=local_addr
+        )
+        request = _vehicle_identification_request(protocol_version)
+        for count, ip in enumerate(_iter_hosts(network_obj), 1):
+            transport.sendto(request, (ip, _UDP_DISCOVERY_PORT))
+            # Let early responses be received while the rest is still being sent, and
+            # stop queueing requests while the send buffer is full
+            if count % 256 == 0:
+                await asyncio.sleep(0)
+            await protocol.drain()
+        return await _collect_responses(queue, network_obj, timeout, protocol_version)
+    except Exception as e:
+        raise exceptions.DiscoveryError(f"Scan of {network_obj} failed: {e}")
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+async def scan_network_async(
+    network: str,
+    timeout: float = 2.0,
+    protocol_version: int = 0x03,
+    max_concurrency: Optional[int] = 64,
+    broadcast: bool = False,
+    max_misses: Optional[int] = None,
+) -> List[ECUInfo]:
+    """
+    Probe every host of a subnet for a DoIP entity without blocking.
+
+    A fixed set of max_concurrency workers runs on the event loop and pulls
+    hosts from the subnet one at a time, so scanning takes roughly
+    ``ceil(hosts / max_concurrency) * timeout`` seconds instead of
+    ``hosts * timeout`` while memory stays bounded by the number of workers,
+    even for large subnets. All requests go through a single UDP socket.
+    Hosts that time out or fail are skipped.
+
+    With broadcast=True a single request is sent to the subnet's broadcast
+    address instead, and responses are collected for one timeout window
+    whatever the subnet size. This only reaches subnets the host is attached
+    to, since routers normally drop directed broadcasts.
+
+    With max_concurrency=None every request is sent right away from a single
+    socket and responses are collected for one timeout window, so the scan takes
+    about ``timeout`` seconds plus the time to send the requests. This floods the
+    network with one datagram per host; keep a limit on shared networks.
+
+    max_misses bounds the time spent on mostly empty ranges: the scan ends
+    early once that many consecutive probes (in completion order) found no
+    entity. Entities further up the range are then not found.
+
+    Args:
+        network: Subnet in CIDR notation (e.g. '192.168.1.0/24')
+        timeout: Per-host request timeout in seconds, or the listen window with
+                 broadcast=True
+        protocol_version: DoIP protocol version (default: 0x03)
+        max_concurrency: Maximum number of concurrent probes (default: 64). None
+                         sends every request at once and listens for one timeout
+                         window
+        broadcast: Sweep the subnet with one broadcast request (default: False)
+        max_misses: Stop probing further hosts once this many probes in a row got
+                    no answer, assuming the rest of the range is empty. Useful for
+                    sparsely populated subnets. Only applies to the per-host probe
+                    (default: None, probe every host)
+
+    Returns:
+        List of discovered ECU information, in address order
+
+    Raises:
+        DiscoveryError: If the network is not a valid CIDR, is too large to probe
+                        host by host (more than 2**24 addresses, e.g. an IPv6 /64),
+                        or the UDP socket cannot be opened
+
+    Example:
+        >>> ecus = asyncio.run(scan_network_async('192.168.1.0/24', timeout=1.0))
+    """
+    try:
+        network_obj = ipaddress.ip_network(network, strict=False)
+    except ValueError as e:
+        raise exceptions.DiscoveryError(f"Invalid network {network}: {e}")
+
+    if broadcast:
+        return await _broadcast_sweep(network_obj, timeout, protocol_version)
+    if network_obj.num_addresses > _MAX_SCAN_ADDRESSES:
+        raise exceptions.DiscoveryError(
+            f"Network {network} is too large to scan host by host "
+            f"({network_obj.num_addresses} addresses, at most {_MAX_SCAN_ADDRESSES})"
+        )
+    if max_concurrency is None:
+        return await _fan_out_sweep(network_obj, timeout, protocol_version)
+
+    # Shared by all workers; the event loop runs one of them at a time
+    hosts = enumerate(_iter_hosts(network_obj))
+    found: Dict[int, ECUInfo] = {}
+    misses = 0
+
+    async def worker(probe: _EntityProbe):
+        nonlocal misses
+        for index, ip in hosts:
+            try:
+                ecu = await _query_entity(probe, ip, timeout, protocol_version)
+            except Exception:
+                ecu = None
+            if ecu is not None:
+                found[index] = ecu
+                misses = 0
+                continue
+            misses += 1
+            if max_misses is not None and misses >= max_misses:
+                return
+
+    # One UDP endpoint serves every probe; responses are matched by source IP
+    try:
+        transport, probe = await _open_entity_probe(ipv6=network_obj.version == 6)
+    except Exception as e:
+        raise exceptions.DiscoveryError(f"Failed to scan {network}: {e}")
+    try:
+        workers = max(1, min(max_concurrency, network_obj.num_addresses))
+        await asyncio.gather(*(worker(probe) for _ in range(workers)))
+    finally:
+        transport.close()
+    return [found[index] for index in sorted(found)]
+
+
+def scan_network(
+    network: str,
+    timeout: float = 2.0,
+    protocol_version: int = 0x03,
+    max_concurrency: Optional[int] = 64,
+    broadcast: bool = False,
+    max_misses: Optional[int] = None,
+) -> List[ECUInfo]:
+    """
+    Probe every host of a subnet for a DoIP entity.
+
+    Runs scan_network_async() on a new event loop. Called from a coroutine, where
+    asyncio.run() cannot be nested, the scan runs on a worker thread instead and
+    blocks the calling event loop until it finishes; await scan_network_async()
+    directly from async code.
+
+    Args:
+        network: Subnet in CIDR notation (e.g. '192.168.1.0/24')
+        timeout: Per-host request timeout in seconds, or the listen window with
+                 broadcast=True
+        protocol_version: DoIP protocol version (default: 0x03)
+        max_concurrency: Maximum number of concurrent probes (default: 64). None
+                         sends every request at once and listens for one timeout
+                         window
+        broadcast: Sweep the subnet with one broadcast request (default: False)
+        max_misses: Stop probing further hosts once this many probes in a row got
+                    no answer, assuming the rest of the range is empty. Useful for
+                    sparsely populated subnets. Only applies to the per-host probe
+                    (default: None, probe every host)
+
+    Returns:
+        List of discovered ECU information, in address order
+
+    Raises:
+        DiscoveryError: If the network is not a valid CIDR, is too large to probe
+                        host by host (more than 2**24 addresses, e.g. an IPv6 /64),
+                        or the UDP socket cannot be opened
+
+    Example:
+        >>> for ecu in scan_network('192.168.1.0/24', timeout=1.0):
+        ...     print(f"Found: {ecu}")
+        >>>
+        >>> # One listen window for the whole subnet
+        >>> ecus = scan_network('192.168.1.0/24', timeout=1.0, broadcast=True)
+    """
+    scan = functools.partial(
+        scan_network_async,
+        network,
+        timeout,
+        protocol_version,
+        max_concurrency,
+        broadcast,
+        max_misses,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(scan())
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(scan())).result()
@@ -34,6 +34,28 @@ class SessionError(UDSonIPException):
 
 
 class ECUNotFoundError(UDSonIPException):
-    """Raised when requested ECU is not found in registry."""
-
-    pass
+    """
+    Raised when requested ECU is not found in registry.
+
+    Args:
+        *args: Optional explicit message
+        name: Name of the ECU that was looked up, available as the ``name`` attribute
+
+    Example:
+        >>> try:
+        ...     manager.switch_to('abs')
+        ... except ECUNotFoundError as e:
+        ...     manager.add_ecu(e.name, 0x00E2)
+    """
+
+    def __init__(self, *args, name=None):
+        # Without a message the name stands in for it, so repr() and pickling keep it
+        super().__init__(*(args or (() if name is None else (name,))))
+        self.name = name
+        self._default_message = not args and name is not None
+
+    def __str__(self):
+        # The default message is only formatted when it is actually displayed
+        if self._default_message:
+            return "ECU '%s' not found in registry" % self.name
+        return super().__str__()
@@ -2,13 +2,93 @@
 Multi-ECU manager for handling multiple ECUs over a single DoIP connection.
 """
 
-from typing import Dict, Optional
+import asyncio
+import threading
+import types
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 from contextlib import contextmanager
 from doipclient import DoIPClient
+from doipclient.messages import DiagnosticMessage
+from udsoncan import Request, Response, services
 from udsoncan.client import Client as UDSClient
-from .connection import UdsOnIpConnection
+from ._util import _hex_addr
+from .connection import AsyncUdsOnIpConnection, UdsOnIpConnection, _Reactor
 from . import exceptions
 
+# Sentinel for registry lookups, so a miss costs a single dict probe
+_MISSING = object()
+
+# TesterPresent with the suppressPosRspMsgIndicationBit set (no response expected)
+_TESTER_PRESENT_SUPPRESSED = b"\x3e\x80"
+
+
+def _release(
+    pool: Dict[str, Tuple[UdsOnIpConnection, UDSClient]],
+    doip: DoIPClient,
+    reactor: _Reactor,
+    keep_alive_stop: threading.Event,
+):
+    """
+    Stop the keep-alive thread, then close the pooled connections, the shared DoIP
+    client and the reactor.
+
+    Takes the resources rather than the manager so that it can run as the
+    manager's weakref finalizer without keeping the manager alive.
+    """
+    # The keep-alive thread must not go on sending on the socket closed below
+    keep_alive_stop.set()
+
+    for connection, _ in pool.values():
+        try:
+            connection.close()
+        except Exception:
+            pass
+    pool.clear()
+
+    try:
+        doip.close()
+    except Exception:
+        pass
+
+    reactor.close()
+
+
+def _keep_alive_loop(
+    doip: DoIPClient,
+    reactor: _Reactor,
+    pool: Dict[str, Tuple[UdsOnIpConnection, UDSClient]],
+    pool_lock: threading.Lock,
+    ecus: Dict[str, int],
+    stop: threading.Event,
+    interval: float,
+):
+    """
+    Send TesterPresent to every pooled ECU until stop is set.
+
+    The request has the suppressPosRspMsgIndicationBit set, so the ECU does not
+    answer it. Only the request is written, under the reactor's I/O lock; the
+    gateway's acknowledgement is skipped by whichever connection reads the socket
+    next, so responses to requests made from other threads are never consumed here.
+
+    Takes the resources rather than the manager so that the running thread does
+    not keep an unreferenced manager alive.
+    """
+    while not stop.wait(interval):
+        with pool_lock:
+            names = list(pool)
+        addresses = [ecus[name] for name in names if name in ecus]
+        for address in addresses:
+            message = DiagnosticMessage(
+                doip._client_logical_address, address, _TESTER_PRESENT_SUPPRESSED
+            )
+            try:
+                with reactor.io_lock:
+                    doip.send_doip_message(message)
+            except Exception:
+                pass
+
 
 class DoIPManager:
     """
@@ -18,6 +98,11 @@ class DoIPManager:
     accessible through a single DoIP gateway. It handles the DoIP connection and
     allows switching between ECUs using a context manager.
 
+    gather_read_did() sends its requests concurrently over the same connection as
+    the synchronous API. A gateway only accepts one connection per tester address,
+    so a separate asyncio connection is only opened when async_client_logical_address
+    gives it an address of its own.
+
     Example:
         >>> from udsonip import DoIPManager
         >>> manager = DoIPManager('192.168.1.10')
@@ -35,6 +120,9 @@ class DoIPManager:
         client_ip: Optional[str] = None,
         client_logical_address: int = 0x0E00,
         protocol_version: int = 3,
+        keep_alive: bool = False,
+        keep_alive_interval: float = 2.0,
+        async_client_logical_address: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -47,24 +135,57 @@ class DoIPManager:
             client_logical_address: Optional. The logical address of the client.
                                     Defaults to 0x0E00.
             protocol_version: Optional. The DoIP protocol version to use. Defaults to 3.
+            keep_alive: Optional. Send TesterPresent to every ECU in use from a single
+                        background thread. Defaults to False.
+            keep_alive_interval: Optional. Seconds between keep-alive rounds. Defaults to 2.0.
+            async_client_logical_address: Optional. Read with gather_read_did() over a
+                                          separate asyncio connection using this client
+                                          logical address. If None (default), its requests
+                                          share the synchronous connection.
             **kwargs: Additional keyword arguments to pass to the underlying DoIPClient.
         """
         self._gateway_ip = gateway_ip
         self._client_ip = client_ip
         self._client_logical_address = client_logical_address
+        if async_client_logical_address == client_logical_address:
+            # The gateway would refuse the second routing activation, or drop the first
+            raise ValueError(
+                f"async_client_logical_address {_hex_addr(async_client_logical_address)} "
+                "must differ from client_logical_address"
+            )
+        self._async_client_logical_address = async_client_logical_address
         self._protocol_version = protocol_version
         self._kwargs = kwargs
 
         # ECU registry: name -> logical address
         self._ecus: Dict[str, int] = {}
+        # Read-only live view handed out by list_ecus()
+        self._ecus_view: Mapping[str, int] = types.MappingProxyType(self._ecus)
 
-        # Cached connections and clients per ECU
-        self._connections: Dict[str, UdsOnIpConnection] = {}
-        self._clients: Dict[str, UDSClient] = {}
+        # Connection pool: name -> (connection, client), built on first use per ECU
+        self._pool: Dict[str, Tuple[UdsOnIpConnection, UDSClient]] = {}
+        # Guards _pool insertions and the initial DoIP connection (see prewarm())
+        self._lock = threading.Lock()
 
-        # Shared DoIP client (created on first use)
+        # Shared DoIP client (created on first use). All registered ECUs are reached
+        # through this single TCP connection and routing activation; each ECU only
+        # gets its own lightweight UdsOnIpConnection carrying its target address.
         self._doip: Optional[DoIPClient] = None
         self._connected = False
+        # Selector shared by all ECU connections, which read from the same socket
+        self._reactor: Optional[_Reactor] = None
+        # Stops keep-alive and releases the connection if the manager is garbage
+        # collected without close()
+        self._finalizer: Optional[weakref.finalize] = None
+
+        # Shared asyncio connection (created on first async use)
+        self._aio: Optional[AsyncUdsOnIpConnection] = None
+
+        # One keep-alive thread for all ECUs (started on first use of an ECU)
+        self._keep_alive = keep_alive
+        self._keep_alive_interval = keep_alive_interval
+        self._keep_alive_stop = threading.Event()
+        self._keep_alive_thread: Optional[threading.Thread] = None
 
     def add_ecu(self, name: str, logical_address: int):
         """
@@ -88,31 +209,42 @@ class DoIPManager:
         Args:
             name: ECU name to remove
         """
-        if name in self._ecus:
-            del self._ecus[name]
+        if self._ecus.pop(name, _MISSING) is not _MISSING:
             # Clean up cached connection/client
-            if name in self._connections:
-                del self._connections[name]
-            if name in self._clients:
-                del self._clients[name]
+            self._pool.pop(name, None)
 
-    def list_ecus(self) -> Dict[str, int]:
+    def list_ecus(self, copy: bool = False) -> Mapping[str, int]:
         """
-        Get a dictionary of all registered ECUs.
+        Get all registered ECUs.
+
+        Args:
+            copy: Return an independent dict instead of the read-only view
+                  (default: False)
 
         Returns:
-            Dictionary mapping ECU names to logical addresses
+            Read-only mapping of ECU names to logical addresses. It reflects later
+            add_ecu()/remove_ecu() calls; pass copy=True for a snapshot.
         """
-        return self._ecus.copy()
+        if copy:
+            return self._ecus.copy()
+        return self._ecus_view
 
-    def _ensure_connected(self):
+    def _ensure_connected(self) -> DoIPClient:
         """
         Ensure the DoIP connection is established.
-        
+
         Per ISO 13400-2:2019, we connect to the first registered ECU for routing
         activation. If no ECUs are registered, we fall back to 0x0001.
+
+        Returns:
+            The connected DoIP client
         """
-        if not self._connected:
+        doip = self._doip
+        if self._connected and doip is not None:
+            return doip
+        with self._lock:
+            if self._connected and self._doip is not None:
+                return self._doip
             # Use first registered ECU address or default gateway address per ISO 13400-2
             if self._ecus:
                 gateway_address = next(iter(self._ecus.values()))
@@ -130,11 +262,16 @@ class DoIPManager:
                     protocol_version=self._protocol_version,
                     **self._kwargs,
                 )
+                self._reactor = _Reactor()
+                self._finalizer = weakref.finalize(
+                    self, _release, self._pool, self._doip, self._reactor, self._keep_alive_stop
+                )
                 self._connected = True
             except Exception as e:
                 raise exceptions.ConnectionError(
                     f"Failed to connect to gateway {self._gateway_ip}: {e}"
                 )
+            return self._doip
 
     def _get_client(self, name: str) -> UDSClient:
         """
@@ -146,28 +283,98 @@ class DoIPManager:
         Returns:
             UDS client instance
         """
-        if name not in self._ecus:
-            raise exceptions.ECUNotFoundError(f"ECU '{name}' not found in registry")
+        # Return cached client if available (only registered ECUs are ever pooled)
+        entry = self._pool.get(name)
+        if entry is not None:
+            return entry[1]
 
-        # Return cached client if available
-        if name in self._clients:
-            return self._clients[name]
+        logical_address = self._ecus.get(name)
+        if logical_address is None:
+            raise exceptions.ECUNotFoundError(name=name)
 
         # Ensure connected
-        self._ensure_connected()
+        doip = self._ensure_connected()
 
         # Create connection and client
-        logical_address = self._ecus[name]
-        connection = UdsOnIpConnection(self._doip, logical_address)
+        connection = UdsOnIpConnection(doip, logical_address, reactor=self._reactor)
         connection.open()
 
         client = UDSClient(connection)
 
-        # Cache for reuse
-        self._connections[name] = connection
-        self._clients[name] = client
+        # Cache for reuse. If another thread won the race, keep its entry.
+        with self._lock:
+            entry = self._pool.setdefault(name, (connection, client))
+        if entry[0] is not connection:
+            connection.close()
+
+        if self._keep_alive:
+            self._start_keep_alive()
 
-        return client
+        return entry[1]
+
+    def _start_keep_alive(self):
+        """
+        Start the keep-alive thread if it is not running yet.
+        """
+        with self._lock:
+            if self._keep_alive_thread is not None:
+                return
+            self._keep_alive_stop.clear()
+            self._keep_alive_thread = threading.Thread(
+                target=_keep_alive_loop,
+                args=(
+                    self._doip,
+                    self._reactor,
+                    self._pool,
+                    self._lock,
+                    self._ecus,
+                    self._keep_alive_stop,
+                    self._keep_alive_interval,
+                ),
+                name="udsonip-keep-alive",
+                daemon=True,
+            )
+            self._keep_alive_thread.start()
+
+    def _stop_keep_alive(self):
+        """
+        Stop the keep-alive thread and wait for it to exit.
+        """
+        thread = self._keep_alive_thread
+        if thread is None:
+            return
+        self._keep_alive_stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        self._keep_alive_thread = None
+
+    def prewarm(self, names: Optional[Iterable[str]] = None):
+        """
+        Build the connections and clients of several ECUs ahead of first use.
+
+        The shared DoIP connection is established once, then the per-ECU clients
+        are created in parallel. Later ecu()/switch_to() calls are served from the
+        pool.
+
+        Args:
+            names: ECU names to prepare (default: all registered ECUs)
+
+        Raises:
+            ECUNotFoundError: If one of the names is not registered
+            ConnectionError: If the gateway connection fails
+
+        Example:
+            >>> manager.prewarm(['engine', 'transmission'])
+        """
+        names = list(self._ecus if names is None else names)
+        if not names:
+            return
+
+        self._ensure_connected()
+        with ThreadPoolExecutor(max_workers=min(32, len(names))) as executor:
+            futures = [executor.submit(self._get_client, name) for name in names]
+        for future in futures:
+            future.result()
 
     @contextmanager
     def ecu(self, name: str):
@@ -189,8 +396,14 @@ class DoIPManager:
         try:
             yield client
         except Exception as e:
-            # Re-raise with ECU context
-            raise type(e)(f"Error communicating with ECU '{name}': {e}") from e
+            # Re-raise the original exception with the ECU as a PEP 678 note; older
+            # Pythons store the note without displaying it in tracebacks
+            note = "Error communicating with ECU '%s'" % name
+            if hasattr(e, "add_note"):
+                e.add_note(note)
+            else:
+                e.__notes__ = getattr(e, "__notes__", []) + [note]  # type: ignore[attr-defined]
+            raise
 
     def switch_to(self, name: str) -> UDSClient:
         """
@@ -207,28 +420,106 @@ class DoIPManager:
         """
         return self._get_client(name)
 
-    def close(self):
+    async def _ensure_connected_async(self) -> AsyncUdsOnIpConnection:
         """
-        Close all connections and clean up resources.
+        Ensure the asyncio DoIP connection is established.
+
+        Returns:
+            The shared AsyncUdsOnIpConnection
         """
-        # Close all cached connections
-        for connection in self._connections.values():
+        if self._aio is None:
+            assert self._async_client_logical_address is not None
+            connection = AsyncUdsOnIpConnection(
+                self._gateway_ip,
+                client_logical_address=self._async_client_logical_address,
+                protocol_version=self._protocol_version,
+            )
             try:
-                connection.close()
-            except Exception:
-                pass
+                await connection.open()
+            except Exception as e:
+                raise exceptions.ConnectionError(
+                    f"Failed to connect to gateway {self._gateway_ip}: {e}"
+                )
+            self._aio = connection
+        return self._aio
 
-        # Disconnect DoIP client
-        if self._doip and self._connected:
+    async def gather_read_did(
+        self, did: int, ecu_names: Optional[Iterable[str]] = None
+    ) -> Dict[str, Union[Response, BaseException]]:
+        """
+        Read a data identifier from several ECUs concurrently.
+
+        The requests are in flight at the same time, so the total time is roughly
+        that of the slowest ECU instead of the sum of all of them. They share the
+        synchronous DoIP connection, each ECU's request running on a worker thread,
+        unless async_client_logical_address selects a separate asyncio connection.
+
+        Args:
+            did: Data identifier to read
+            ecu_names: ECU names to read from (default: all registered ECUs)
+
+        Returns:
+            Dictionary mapping ECU names to their response, or to the exception
+            raised while reading from that ECU
+
+        Example:
+            >>> results = await manager.gather_read_did(0xF190, ['engine', 'abs'])
+            >>> print(results['engine'].data)
+        """
+        # A name listed twice is read once; its client must not be used concurrently
+        names = list(dict.fromkeys(self._ecus if ecu_names is None else ecu_names))
+        for name in names:
+            if name not in self._ecus:
+                raise exceptions.ECUNotFoundError(name=name)
+
+        tasks: List[Awaitable[Response]]
+        if self._async_client_logical_address is None:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._ensure_connected)
+            request = services.ReadDataByIdentifier.make_request(didlist=did, didconfig=None)
+            tasks = [
+                loop.run_in_executor(None, self._send_request, name, request) for name in names
+            ]
+        else:
+            connection = await self._ensure_connected_async()
+            tasks = [
+                asyncio.ensure_future(connection.read_data_by_identifier(self._ecus[name], did))
+                for name in names
+            ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return dict(zip(names, results))
+
+    def _send_request(self, name: str, request: Request) -> Response:
+        """Send a raw request to an ECU over the synchronous connection."""
+        response = self._get_client(name).send_request(request)
+        # Only None when the positive response is suppressed, which a read never is
+        assert response is not None
+        return response
+
+    async def aclose(self):
+        """
+        Close the asyncio connection as well as all synchronous connections.
+        """
+        if self._aio is not None:
             try:
-                self._doip.close()
+                await self._aio.close()
             except Exception:
                 pass
-            self._connected = False
+            self._aio = None
+        self.close()
+
+    def close(self):
+        """
+        Close all connections and clean up resources.
+        """
+        self._stop_keep_alive()
 
-        # Clear caches
-        self._connections.clear()
-        self._clients.clear()
+        # Closes the pooled connections, DoIP client and reactor (at most once)
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._connected = False
+        self._reactor = None
 
     def __enter__(self):
         """
@@ -242,9 +533,3 @@ class DoIPManager:
         Context manager exit.
         """
         self.close()
-
-    def __del__(self):
-        """
-        Cleanup on deletion.
-        """
-        self.close()